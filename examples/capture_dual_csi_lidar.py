@@ -54,8 +54,6 @@ class DualCSICapture:
             f"video/x-raw(memory:NVMM), width=1280, height=720, format=NV12, framerate={self.fps}/1 ! "
             f"nvvidconv flip-method=0 ! "
             f"video/x-raw, width={self.width}, height={self.height}, format=BGRx ! "
-            f"videoconvert ! "
-            f"video/x-raw, format=BGR ! "
             f"appsink drop=1"
         )
     
@@ -76,11 +74,11 @@ class DualCSICapture:
             else:
                 print("✓ CAM1 initialized")
             
-            # Warm up
+            # Warm up (grab only, nothing to convert)
             for _ in range(5):
-                self.cam0.read()
+                self.cam0.grab()
                 if self.cam1:
-                    self.cam1.read()
+                    self.cam1.grab()
             
             return True
             
@@ -95,13 +93,11 @@ class DualCSICapture:
         
         if self.cam0:
             ret, frame0 = self.cam0.read()
-            if not ret:
-                frame0 = None
+            frame0 = cv2.cvtColor(frame0, cv2.COLOR_BGRA2BGR) if ret else None
         
         if self.cam1:
             ret, frame1 = self.cam1.read()
-            if not ret:
-                frame1 = None
+            frame1 = cv2.cvtColor(frame1, cv2.COLOR_BGRA2BGR) if ret else None
         
         return frame0, frame1
     
@@ -2,27 +2,24 @@
 
 __version__ = "0.1.0"
 
+import importlib
+
 from .core.frame import SensorFrame, SensorMetadata, SensorType, FrameType
 from .core.sensor import Sensor
 
-from .drivers import (
-    CSICamera,
-    MultiCamera,
-    RPLidarSensor,
-    OakDPro,
-    discover_rplidars,
-    discover_oakd_devices,
-)
-
-from .sync import (
-    TimestampManager,
-    SyncedSensorFusion,
-)
-
-from .storage import (
-    HDF5Writer,
-    HDF5Reader,
-)
+# Driver, sync and storage exports resolve lazily (see drivers/__init__.py)
+_LAZY = {
+    "CSICamera": "drivers",
+    "MultiCamera": "drivers",
+    "RPLidarSensor": "drivers",
+    "OakDPro": "drivers",
+    "discover_rplidars": "drivers",
+    "discover_oakd_devices": "drivers",
+    "TimestampManager": "sync",
+    "SyncedSensorFusion": "sync",
+    "HDF5Writer": "storage",
+    "HDF5Reader": "storage",
+}
 
 __all__ = [
     "SensorFrame",
@@ -41,3 +38,16 @@ __all__ = [
     "HDF5Writer",
     "HDF5Reader",
 ]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_LAZY[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
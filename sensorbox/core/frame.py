@@ -8,7 +8,7 @@ providing consistent timestamps, metadata, and type information.
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any
+from typing import Any, Mapping
 import numpy as np
 
 
@@ -38,7 +38,7 @@ class SensorMetadata:
     calibration: dict = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class SensorFrame:
     """
     A single reading from a sensor.
@@ -51,7 +51,8 @@ class SensorFrame:
         wall_time: Wall clock time for human reference
         sequence_number: Monotonically increasing frame counter
         data: The actual sensor data (numpy array)
-        metadata: Additional frame-specific metadata
+        metadata: Additional frame-specific metadata (drivers may pass a
+            shared read-only mapping, so copy it before modifying)
     """
     sensor_id: str
     sensor_type: SensorType
@@ -60,7 +61,7 @@ class SensorFrame:
     wall_time: datetime
     sequence_number: int
     data: np.ndarray
-    metadata: dict = field(default_factory=dict)
+    metadata: Mapping[str, Any] = field(default_factory=dict)
     
     @property
     def shape(self) -> tuple:
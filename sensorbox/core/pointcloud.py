@@ -4,6 +4,11 @@ import numpy as np
 from typing import Optional, Tuple
 from dataclasses import dataclass
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to NumPy
+    njit = None
+
 
 @dataclass
 class CameraIntrinsics:
@@ -46,6 +51,7 @@ def depth_to_pointcloud(
     intrinsics: Optional[CameraIntrinsics] = None,
     max_depth: float = 10000.0,
     subsample: int = 1,
+    out: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     """
     Convert depth image to 3D point cloud.
@@ -55,44 +61,67 @@ def depth_to_pointcloud(
         intrinsics: Camera intrinsics (auto-detected if None)
         max_depth: Maximum depth to include (mm)
         subsample: Subsample factor
+        out: Optional float32 buffer with at least
+            ceil(H / subsample) * ceil(W / subsample) rows of 3, reused
+            across frames; the result is then a view into it
     
     Returns:
-        Point cloud as (N, 3) array with X, Y, Z in meters
+        Point cloud as (N, 3) float32 array with X, Y, Z in meters
     """
     h, w = depth.shape
     
     if intrinsics is None:
         intrinsics = get_intrinsics_for_depth(depth.shape)
     
-    # Create pixel coordinate grids
-    u = np.arange(0, w, subsample)
-    v = np.arange(0, h, subsample)
-    u, v = np.meshgrid(u, v)
-    
-    # Get depth values (subsampled)
-    z = depth[::subsample, ::subsample].astype(np.float32)
-    
-    # Filter invalid depths
-    valid = (z > 0) & (z < max_depth)
-    
-    # Convert to meters
-    z_m = z / 1000.0
-    
-    # Back-project to 3D
-    x = (u - intrinsics.cx) * z_m / intrinsics.fx
-    y = (v - intrinsics.cy) * z_m / intrinsics.fy
-    
-    # Rotate 180° to match RGB orientation (depth was flipped with flipud)
-    # x = -x  # Not needed
-    y = -y
-    
-    # Stack and filter
-    points = np.stack([x, y, z_m], axis=-1)
-    points = points[valid]
+    # Rotate 180° to match RGB orientation (depth is read as a vertically flipped view):
+    # x is kept as is and y is negated
+    if njit is not None:
+        if out is None:
+            out = np.empty((-(-h // subsample) * -(-w // subsample), 3), dtype=np.float32)
+        n = _backproject_kernel(
+            depth, subsample, max_depth,
+            intrinsics.fx, intrinsics.fy, intrinsics.cx, intrinsics.cy, out,
+        )
+        return out[:n]
+    
+    # Filter on the subsampled view first, then back-project only the
+    # valid pixels (float32 coordinates keep the output float32)
+    z = depth[::subsample, ::subsample]
+    v_idx, u_idx = np.nonzero((z > 0) & (z < max_depth))
+    z_m = z[v_idx, u_idx].astype(np.float32) * np.float32(0.001)
+    u = np.arange(0, w, subsample, dtype=np.float32)[u_idx]
+    v = np.arange(0, h, subsample, dtype=np.float32)[v_idx]
+    
+    if out is None:
+        points = np.empty((len(z_m), 3), dtype=np.float32)
+    else:
+        points = out[:len(z_m)]
+    np.multiply(u - np.float32(intrinsics.cx), z_m, out=points[:, 0])
+    points[:, 0] /= np.float32(intrinsics.fx)
+    np.multiply(np.float32(intrinsics.cy) - v, z_m, out=points[:, 1])
+    points[:, 1] /= np.float32(intrinsics.fy)
+    points[:, 2] = z_m
     
     return points
 
 
+if njit is not None:
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def _backproject_kernel(depth, subsample, max_depth, fx, fy, cx, cy, out):
+        """Strided validity test and back-projection in one pass; returns the point count."""
+        n = 0
+        for r in range(0, depth.shape[0], subsample):
+            for c in range(0, depth.shape[1], subsample):
+                d = depth[r, c]
+                if d > 0 and d < max_depth:
+                    z = np.float32(d) * np.float32(0.001)
+                    out[n, 0] = (c - cx) * z / fx
+                    out[n, 1] = (cy - r) * z / fy
+                    out[n, 2] = z
+                    n += 1
+        return n
+
+
 def depth_to_colored_pointcloud(
     depth: np.ndarray,
     rgb: np.ndarray,
@@ -116,9 +145,9 @@ def depth_to_colored_pointcloud(
     else:
         rgb_resized = rgb
     
-    # Create pixel coordinate grids
-    u = np.arange(0, w, subsample)
-    v = np.arange(0, h, subsample)
+    # Create pixel coordinate grids (float32 keeps the output float32)
+    u = np.arange(0, w, subsample, dtype=np.float32)
+    v = np.arange(0, h, subsample, dtype=np.float32)
     u, v = np.meshgrid(u, v)
     
     # Get depth and color values (subsampled)
@@ -7,8 +7,7 @@ import numpy as np
 import cv2
 import time
 import threading
-from dataclasses import dataclass
-from typing import Optional, List
+from typing import Optional
 
 st.set_page_config(
     page_title="Dual CSI + RPLIDAR",
@@ -17,11 +16,8 @@ st.set_page_config(
 )
 
 
-@dataclass
-class LidarPoint:
-    angle: float
-    distance: float
-    quality: int
+# Upper bound on measurements in one rotation (A1 delivers ~360-720)
+MAX_SCAN_POINTS = 8192
 
 
 class CSICamera:
@@ -45,8 +41,6 @@ class CSICamera:
             f"video/x-raw(memory:NVMM), width=1280, height=720, format=NV12, framerate=30/1 ! "
             f"nvvidconv flip-method=2 ! "
             f"video/x-raw, width={self.width}, height={self.height}, format=BGRx ! "
-            f"videoconvert ! "
-            f"video/x-raw, format=BGR ! "
             f"appsink drop=1"
         )
     
@@ -85,8 +79,14 @@ class CSICamera:
             time.sleep(0.001)
     
     def read(self) -> Optional[np.ndarray]:
+        # The BGRx -> BGR strip doubles as the defensive copy; cvtColor's
+        # SIMD path is much faster than GStreamer's scalar videoconvert
         with self._lock:
-            return self._frame.copy() if self._frame is not None else None
+            if self._frame is None:
+                return None
+            if self._frame.ndim == 3 and self._frame.shape[2] == 4:
+                return cv2.cvtColor(self._frame, cv2.COLOR_BGRA2BGR)
+            return self._frame.copy()
     
     def stop(self):
         self._running = False
@@ -102,7 +102,9 @@ class RPLidarDriver:
         self.port = port
         self.lidar = None
         self._running = False
-        self._scan_data: List[LidarPoint] = []
+        # Latest scan as (N, 3) float32: angle_deg, distance_mm, quality
+        self._scan_data = np.empty((0, 3), dtype=np.float32)
+        self._ring = np.empty((MAX_SCAN_POINTS, 3), dtype=np.float32)
         self._lock = threading.Lock()
         self._thread = None
     
@@ -130,23 +132,32 @@ class RPLidarDriver:
             return False
     
     def _scan_loop(self):
+        # Measurements go straight into a fixed ring; a scan is published
+        # as soon as the next rotation starts instead of waiting on iter_scans
+        ring = self._ring
+        idx = 0
         try:
-            for scan in self.lidar.iter_scans():
+            for new_scan, quality, angle, distance in self.lidar.iter_measures():
                 if not self._running:
                     break
-                points = [
-                    LidarPoint(angle=m[1], distance=m[2], quality=m[0])
-                    for m in scan if m[2] > 0
-                ]
-                with self._lock:
-                    self._scan_data = points
+                if new_scan and idx > 0:
+                    scan = ring[:idx].copy()
+                    with self._lock:
+                        self._scan_data = scan
+                    idx = 0
+                if distance > 0 and idx < MAX_SCAN_POINTS:
+                    ring[idx, 0] = angle
+                    ring[idx, 1] = distance
+                    ring[idx, 2] = quality
+                    idx += 1
         except Exception as e:
             if self._running:
                 print(f"Scan error: {e}")
     
-    def get_scan(self) -> List[LidarPoint]:
+    def get_scan(self) -> np.ndarray:
+        # Published scans are never mutated, so no copy is needed
         with self._lock:
-            return self._scan_data.copy()
+            return self._scan_data
     
     def stop(self):
         self._running = False
@@ -161,7 +172,7 @@ class RPLidarDriver:
                 pass
 
 
-def create_cartesian_plot(scan_data: List[LidarPoint], max_distance: float = 6000) -> np.ndarray:
+def create_cartesian_plot(scan_data: np.ndarray, max_distance: float = 6000) -> np.ndarray:
     size = 500
     img = np.zeros((size, size, 3), dtype=np.uint8)
     img[:] = (14, 17, 23)
@@ -172,15 +183,16 @@ def create_cartesian_plot(scan_data: List[LidarPoint], max_distance: float = 600
         cv2.circle(img, (center, center), radius, (40, 40, 40), 1)
     cv2.line(img, (center, 0), (center, size), (40, 40, 40), 1)
     cv2.line(img, (0, center), (size, center), (40, 40, 40), 1)
-    if scan_data:
-        for p in scan_data:
-            angle_rad = np.radians(p.angle - 90)
-            x = int(center + p.distance * scale * np.cos(angle_rad))
-            y = int(center + p.distance * scale * np.sin(angle_rad))
-            if 0 <= x < size and 0 <= y < size:
-                color_val = int(255 * (1 - p.distance / max_distance))
-                color = (0, color_val, 255 - color_val)
-                cv2.circle(img, (x, y), 2, color, -1)
+    if len(scan_data):
+        angle_rad = np.radians(scan_data[:, 0] - 90)
+        distance = scan_data[:, 1]
+        xs = (center + distance * scale * np.cos(angle_rad)).astype(np.int32)
+        ys = (center + distance * scale * np.sin(angle_rad)).astype(np.int32)
+        color_vals = (255 * (1 - distance / max_distance)).astype(np.int32)
+        in_view = (xs >= 0) & (xs < size) & (ys >= 0) & (ys < size)
+        for x, y, color_val in zip(xs[in_view], ys[in_view], color_vals[in_view]):
+            color = (0, int(color_val), 255 - int(color_val))
+            cv2.circle(img, (int(x), int(y)), 2, color, -1)
     cv2.circle(img, (center, center), 5, (0, 255, 0), -1)
     return img
 
@@ -251,11 +263,11 @@ def main():
                     st.success(f"Saved cam1_{timestamp}.jpg")
             if st.session_state.lidar:
                 scan = st.session_state.lidar.get_scan()
-                if scan:
+                if len(scan):
                     with open(f"lidar_{timestamp}.csv", 'w') as f:
                         f.write("angle,distance,quality\n")
-                        for p in scan:
-                            f.write(f"{p.angle},{p.distance},{p.quality}\n")
+                        for angle, distance, quality in scan:
+                            f.write(f"{angle},{distance},{int(quality)}\n")
                     st.success(f"Saved lidar_{timestamp}.csv")
     
     st.divider()
@@ -292,8 +304,8 @@ def main():
                 scan_data = st.session_state.lidar.get_scan()
                 lidar_img = create_cartesian_plot(scan_data, max_lidar_range)
                 lidar_placeholder.image(lidar_img, use_container_width=True)
-                if scan_data:
-                    distances = [p.distance for p in scan_data]
+                if len(scan_data):
+                    distances = scan_data[:, 1]
                     stats_placeholder.markdown(f"""
                     **Points:** {len(scan_data)}  
                     **Min Distance:** {min(distances)/1000:.2f} m  
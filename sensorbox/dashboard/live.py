@@ -5,12 +5,38 @@ import plotly.graph_objects as go
 import numpy as np
 from pathlib import Path
 import sys
-import time
+from typing import Optional
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from sensorbox.live.stream import LiveStreamManager
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; fall back to NumPy
+    njit = None
+
+# Upper bound on markers sent to the browser per point-cloud update
+MAX_PLOT_POINTS = 8000
+
+# Fixed RGB display width (px) so the image element never re-lays out
+RGB_DISPLAY_WIDTH = 640
+
+# Static layouts, shared by every figure built in the session
+_DEPTH_LAYOUT = dict(
+    height=250,
+    margin=dict(l=10, r=60, t=10, b=10),
+    xaxis=dict(visible=False),
+    yaxis=dict(visible=False, scaleanchor='x'),
+    uirevision='depth',
+)
+
+_PC_LAYOUT = dict(
+    height=300,
+    margin=dict(l=50, r=70, t=10, b=40),
+    yaxis=dict(scaleanchor="x"),
+)
+
 
 def main():
     st.set_page_config(
@@ -26,26 +52,35 @@ def main():
     if 'streaming' not in st.session_state:
         st.session_state.streaming = False
     
-    # Sidebar controls
-    st.sidebar.header("Stream Settings")
-    
-    oakd_enabled = st.sidebar.checkbox("OAK-D Pro", value=True)
-    enable_pointcloud = st.sidebar.checkbox("Point Cloud", value=True)
-    fps_target = st.sidebar.slider("Target FPS", 5, 30, 15)
-    
-    depth_quality = st.sidebar.select_slider(
-        "Depth Quality",
-        options=["fast", "balanced", "high"],
-        value="fast",
-        help="Fast: More points. High: Less noise."
-    )
-    
-    # IR Toggle
-    use_ir = st.sidebar.checkbox(
-        "🔦 IR Dot Projector", 
-        value=False,
-        help="Enable for low-light or textureless surfaces (white walls). Disable for bright scenes."
-    )
+    # Sidebar controls. Settings live in a form so adjusting them doesn't
+    # rerun the script until Apply; the projection stays outside because
+    # switching it is cheap and should take effect immediately.
+    with st.sidebar.form("controls"):
+        st.header("Stream Settings")
+        
+        oakd_enabled = st.checkbox("OAK-D Pro", value=True)
+        enable_pointcloud = st.checkbox("Point Cloud", value=True)
+        fps_target = st.slider("Target FPS", 5, 30, 15)
+        
+        depth_quality = st.select_slider(
+            "Depth Quality",
+            options=["fast", "balanced", "high"],
+            value="fast",
+            help="Fast: More points. High: Less noise."
+        )
+        
+        # IR Toggle
+        use_ir = st.checkbox(
+            "🔦 IR Dot Projector", 
+            value=False,
+            help="Enable for low-light or textureless surfaces (white walls). Disable for bright scenes."
+        )
+        
+        st.header("Depth Filter")
+        min_depth = st.slider("Min Depth (m)", 0.1, 2.0, 0.2, 0.1)
+        max_depth = st.slider("Max Depth (m)", 0.5, 5.0, 1.5, 0.1)
+        
+        st.form_submit_button("Apply", use_container_width=True)
     
     st.sidebar.header("Point Cloud View")
     pc_view = st.sidebar.radio(
@@ -54,10 +89,6 @@ def main():
         index=0,
     )
     
-    st.sidebar.header("Depth Filter")
-    min_depth = st.sidebar.slider("Min Depth (m)", 0.1, 2.0, 0.2, 0.1)
-    max_depth = st.sidebar.slider("Max Depth (m)", 0.5, 5.0, 1.5, 0.1)
-    
     col1, col2 = st.sidebar.columns(2)
     start_btn = col1.button("▶ Start", use_container_width=True)
     stop_btn = col2.button("⏹ Stop", use_container_width=True)
@@ -79,19 +110,45 @@ def main():
             st.session_state.stream_manager.stop()
             st.session_state.stream_manager = None
         st.session_state.streaming = False
+        st.session_state.pop('last_frame', None)
+        st.session_state.pop('live_figures', None)
+        st.session_state.pop('depth_buffer', None)
+        st.session_state.pop('depth_signature', None)
+        st.session_state.pop('rgb_jpeg', None)
         st.rerun()
     
     if st.session_state.streaming:
         st.sidebar.success("🟢 Streaming")
     else:
         st.sidebar.info("⚪ Stopped")
-        st.info("Click **Start** to begin live streaming. Adjust settings in sidebar, then click Start.")
+        st.info("Click **Start** to begin live streaming. Adjust settings in sidebar, click Apply, then click Start.")
         return
     
     manager = st.session_state.stream_manager
     if manager is None:
         return
     
+    # The stream view reruns on its own schedule instead of looping inside
+    # the script, so figures persist and only their trace data changes
+    stream_view = st.fragment(run_every=1.0 / fps_target)(_stream_view)
+    stream_view(manager, pc_view, min_depth, max_depth, fps_target)
+
+
+def _stream_view(
+    manager: LiveStreamManager,
+    pc_view: str,
+    min_depth: float,
+    max_depth: float,
+    fps_target: float,
+):
+    """Render the latest frame into persistent figures (one fragment tick)."""
+    # Wait at most one frame period; the fragment schedule sets the cadence
+    frame = manager.get_frame(timeout=1.0 / fps_target)
+    if frame is None:
+        frame = st.session_state.get('last_frame')
+    else:
+        st.session_state.last_frame = frame
+    
     col1, col2 = st.columns(2)
     
     with col1:
@@ -113,57 +170,103 @@ def main():
         st.subheader("Info")
         info_placeholder = st.empty()
     
-    # Streaming loop
-    filtered_points = []
-    while st.session_state.streaming:
-        frame = manager.get_frame(timeout=0.5)
+    if frame is None:
+        info_placeholder.info("Waiting for frames...")
+        return
+    
+    if frame.rgb is not None:
+        rgb_placeholder.image(_encode_rgb(frame), width=RGB_DISPLAY_WIDTH)
+    
+    if frame.depth is not None:
+        fig = _get_figure(
+            "depth", (min_depth, max_depth),
+            lambda: create_depth_heatmap(min_depth, max_depth),
+        )
+        # Skip the mask and trace update when the frame (identified by its
+        # timestamp, as in _encode_rgb) and range are unchanged
+        signature = (min_depth, max_depth, frame.timestamp)
+        if st.session_state.get('depth_signature') != signature:
+            buf = st.session_state.get('depth_buffer')
+            if buf is None or buf.shape != frame.depth.shape:
+                buf = np.empty(frame.depth.shape, dtype=np.float32)
+                st.session_state.depth_buffer = buf
+            update_depth_heatmap(fig, frame.depth, min_depth, max_depth, out=buf)
+            st.session_state.depth_signature = signature
+        depth_placeholder.plotly_chart(fig, use_container_width=True, key="live_depth")
+    
+    n_points_filtered = 0
+    if frame.pointcloud is not None and len(frame.pointcloud) > 0:
+        # Filter each column separately: np.compress makes one linear pass
+        # per component instead of gathering whole (N, 3) rows
+        x, y, z = frame.pointcloud.T
+        keep = (z >= min_depth) & (z <= max_depth)
+        x_f, y_f, z_f = (np.compress(keep, c).astype(np.float32, copy=False) for c in (x, y, z))
+        n_points_filtered = len(z_f)
         
-        if frame:
-            if frame.rgb is not None:
-                rgb_placeholder.image(frame.rgb, channels="BGR", use_container_width=True)
-            
-            if frame.depth is not None:
-                fig = create_depth_heatmap(frame.depth, min_depth, max_depth)
-                depth_placeholder.plotly_chart(fig, use_container_width=True, key=f"depth_{time.time()}")
-            
-            if frame.pointcloud is not None and len(frame.pointcloud) > 0:
-                z = frame.pointcloud[:, 2]
-                mask = (z >= min_depth) & (z <= max_depth)
-                filtered_points = frame.pointcloud[mask]
-                
-                if len(filtered_points) > 0:
-                    fig = create_pointcloud_plot(filtered_points, pc_view, min_depth, max_depth)
-                    pc_placeholder.plotly_chart(fig, use_container_width=True, key=f"pc_{time.time()}")
-                else:
-                    pc_placeholder.warning("No points in depth range")
-            
-            n_points_total = len(frame.pointcloud) if frame.pointcloud is not None else 0
-            n_points_filtered = len(filtered_points) if len(filtered_points) > 0 else 0
-            
-            info_text = f"""
+        if n_points_filtered > 0:
+            fig = _get_figure(
+                "pointcloud", (pc_view, min_depth, max_depth),
+                lambda: create_pointcloud_plot(pc_view, min_depth, max_depth),
+            )
+            # Strided view: zero-copy and bounded marker count
+            step = max(1, n_points_filtered // MAX_PLOT_POINTS)
+            update_pointcloud_plot(
+                fig, x_f[::step], y_f[::step], z_f[::step], pc_view,
+                min_depth, max_depth,
+            )
+            pc_placeholder.plotly_chart(fig, use_container_width=True, key="live_pointcloud")
+        else:
+            pc_placeholder.warning("No points in depth range")
+    
+    n_points_total = len(frame.pointcloud) if frame.pointcloud is not None else 0
+    
+    info_text = f"""
 **FPS:** {frame.fps:.1f}  
 **Timestamp:** {frame.timestamp:.2f}s  
 **Points (filtered):** {n_points_filtered:,} / {n_points_total:,}  
 **Depth Valid:** {frame.depth_valid_pct:.1f}%  
 **Depth Range:** {min_depth:.1f} - {max_depth:.1f} m
 """
-            if frame.imu:
-                acc = frame.imu['accelerometer']
-                info_text += f"\n**Accel:** ({acc['x']:.2f}, {acc['y']:.2f}, {acc['z']:.2f})"
-            
-            info_placeholder.markdown(info_text)
-        
-        time.sleep(0.05)
+    if frame.imu:
+        acc = frame.imu['accelerometer']
+        info_text += f"\n**Accel:** ({acc['x']:.2f}, {acc['y']:.2f}, {acc['z']:.2f})"
+    
+    info_placeholder.markdown(info_text)
 
 
-def create_depth_heatmap(depth: np.ndarray, min_depth_m: float, max_depth_m: float) -> go.Figure:
-    depth_m = depth.astype(np.float32) / 1000.0
-    depth_m[depth == 0] = np.nan
-    depth_m[depth_m < min_depth_m] = np.nan
-    depth_m[depth_m > max_depth_m] = np.nan
+def _encode_rgb(frame) -> bytes:
+    """JPEG-encode the frame's BGR image, reusing the last encoding for a repeated frame.
     
+    Streamlit passes encoded bytes through as-is instead of PNG-encoding
+    the raw array with Pillow on every rerun.
+    """
+    import cv2
+    
+    cached = st.session_state.get('rgb_jpeg')
+    if cached is not None and cached[0] == frame.timestamp:
+        return cached[1]
+    
+    ok, buf = cv2.imencode('.jpg', frame.rgb, [cv2.IMWRITE_JPEG_QUALITY, 80])
+    if not ok:
+        raise ValueError("JPEG encoding of RGB frame failed")
+    data = buf.tobytes()
+    st.session_state.rgb_jpeg = (frame.timestamp, data)
+    return data
+
+
+def _get_figure(name: str, config: tuple, factory) -> go.Figure:
+    """Return the session's figure for ``name``, rebuilding it only when ``config`` changes."""
+    figures = st.session_state.setdefault('live_figures', {})
+    cached = figures.get(name)
+    if cached is None or cached[0] != config:
+        cached = (config, factory())
+        figures[name] = cached
+    return cached[1]
+
+
+def create_depth_heatmap(min_depth_m: float, max_depth_m: float) -> go.Figure:
     fig = go.Figure(data=go.Heatmap(
-        z=depth_m,
+        z=[[]],
         colorscale='Turbo',
         zmin=min_depth_m,
         zmax=max_depth_m,
@@ -171,50 +274,118 @@ def create_depth_heatmap(depth: np.ndarray, min_depth_m: float, max_depth_m: flo
         hoverongaps=False,
     ))
     
-    fig.update_layout(
-        height=250,
-        margin=dict(l=10, r=60, t=10, b=10),
-        xaxis=dict(visible=False),
-        yaxis=dict(visible=False, scaleanchor='x'),
-    )
+    fig.update_layout(_DEPTH_LAYOUT)
     return fig
 
 
-def create_pointcloud_plot(points: np.ndarray, view: str, min_depth: float, max_depth: float) -> go.Figure:
-    x, y, z = points[:, 0], points[:, 1], points[:, 2]
+if njit is not None:
+    # Every fastmath flag except nnan/ninf, since the kernel writes NaN
+    @njit(parallel=True, fastmath={"nsz", "arcp", "contract", "afn", "reassoc"}, cache=True)
+    def _mask_depth_kernel(depth, out, min_depth_m, max_depth_m):
+        for i in prange(depth.shape[0]):
+            for j in range(depth.shape[1]):
+                v = depth[i, j]
+                f = v * 0.001
+                if v == 0 or f < min_depth_m or f > max_depth_m:
+                    out[i, j] = np.nan
+                else:
+                    out[i, j] = f
+
+
+def update_depth_heatmap(
+    fig: go.Figure,
+    depth: np.ndarray,
+    min_depth_m: float,
+    max_depth_m: float,
+    out: Optional[np.ndarray] = None,
+) -> None:
+    """Write depth (mm) into the heatmap as meters, NaN outside the range.
+    
+    ``out`` is an optional float32 buffer of the same shape, reused across
+    frames to avoid a per-frame allocation.
+    """
+    if out is None:
+        out = np.empty(depth.shape, dtype=np.float32)
+    if njit is not None:
+        _mask_depth_kernel(depth, out, min_depth_m, max_depth_m)
+    else:
+        np.multiply(depth, 1.0 / 1000.0, out=out, dtype=np.float32)
+        invalid = (depth == 0) | (out < min_depth_m) | (out > max_depth_m)
+        np.putmask(out, invalid, np.nan)
     
+    with fig.batch_update():
+        fig.data[0].update(z=out)
+
+
+def _project_points(x: np.ndarray, y: np.ndarray, z: np.ndarray, view: str) -> tuple:
+    if view == "Top-Down (Z vs X)":
+        return x, z
+    elif view == "Front (Y vs X)":
+        return x, -y
+    else:
+        return z, -y
+
+
+def create_pointcloud_plot(view: str, min_depth: float, max_depth: float) -> go.Figure:
+    # Fixed ranges from the depth filter so plotly.js never autoranges
+    # over the data; lateral extent is bounded by the max depth
+    depth_range = [min_depth, max_depth]
+    lateral_range = [-max_depth, max_depth]
     if view == "Top-Down (Z vs X)":
-        plot_x, plot_y = x, z
         x_label, y_label = "X (m)", "Z (m)"
+        x_range, y_range = lateral_range, depth_range
     elif view == "Front (Y vs X)":
-        plot_x, plot_y = x, -y
         x_label, y_label = "X (m)", "Y (m)"
+        x_range, y_range = lateral_range, lateral_range
     else:
-        plot_x, plot_y = z, -y
         x_label, y_label = "Z (m)", "Y (m)"
+        x_range, y_range = depth_range, lateral_range
     
-    fig = go.Figure(data=go.Scatter(
-        x=plot_x, y=plot_y,
+    fig = go.Figure(data=go.Scattergl(
+        x=[], y=[],
         mode='markers',
         marker=dict(
             size=5,
-            color=z,
             colorscale='Turbo',
-            cmin=min_depth,
-            cmax=max_depth,
-            colorbar=dict(title=dict(text='m'), tickformat='.2f', thickness=15),
+            cmin=0,
+            cmax=255,
+            colorbar=dict(
+                title=dict(text='m'),
+                tickvals=np.linspace(0, 255, 5),
+                ticktext=[f"{v:.2f}" for v in np.linspace(min_depth, max_depth, 5)],
+                thickness=15,
+            ),
         ),
     ))
     
+    fig.update_layout(_PC_LAYOUT)
     fig.update_layout(
-        xaxis_title=x_label,
-        yaxis_title=y_label,
-        height=300,
-        margin=dict(l=50, r=70, t=10, b=40),
-        yaxis=dict(scaleanchor="x"),
+        xaxis=dict(title=x_label, range=x_range),
+        yaxis=dict(title=y_label, range=y_range),
+        uirevision=view,
     )
     return fig
 
 
+def update_pointcloud_plot(
+    fig: go.Figure,
+    x: np.ndarray,
+    y: np.ndarray,
+    z: np.ndarray,
+    view: str,
+    min_depth: float,
+    max_depth: float,
+) -> None:
+    plot_x, plot_y = _project_points(x, y, z, view)
+    
+    # Colour by uint8 depth bins: a quarter of the float payload per point,
+    # and the colorbar ticks map the bins back to meters
+    scale = 255.0 / max(max_depth - min_depth, 1e-6)
+    color = np.clip((z - min_depth) * scale, 0, 255).astype(np.uint8)
+    
+    with fig.batch_update():
+        fig.data[0].update(x=plot_x, y=plot_y, marker={'color': color})
+
+
 if __name__ == "__main__":
     main()
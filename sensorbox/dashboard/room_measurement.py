@@ -77,7 +77,7 @@ def main():
     with col1:
         st.subheader("📡 RPLIDAR 2D Scan (Top-Down)")
         if st.session_state.lidar_points is not None:
-            fig = plot_lidar_scan(
+            fig = cached_lidar_scan_figure(
                 st.session_state.lidar_points,
                 st.session_state.walls
             )
@@ -154,10 +154,12 @@ def capture_data(num_lidar_scans: int, num_depth_frames: int):
     
     with st.spinner("Capturing RGB and depth frames..."):
         try:
-            st.session_state.depth_points, st.session_state.rgb_image = rm.capture_depth_and_rgb(
+            depth_points, st.session_state.rgb_image = rm.capture_depth_and_rgb(
                 num_frames=num_depth_frames,
                 show_progress=False
             )
+            # float32 halves what gets serialized to the browser
+            st.session_state.depth_points = depth_points.astype(np.float32, copy=False)
             st.success(f"Captured {len(st.session_state.depth_points)} depth points")
         except Exception as e:
             st.error(f"Depth capture failed: {e}")
@@ -185,12 +187,27 @@ def measure_room():
     st.rerun()
 
 
+def cached_lidar_scan_figure(points: np.ndarray, walls=None) -> go.Figure:
+    """Return the LIDAR figure, rebuilding it only when points or walls change."""
+    key = (
+        points.shape,
+        hash(points.tobytes()),
+        tuple((wall.start, wall.end) for wall in walls or ()),
+    )
+    cached = st.session_state.get('lidar_figure')
+    if cached is None or cached[0] != key:
+        cached = (key, plot_lidar_scan(points, walls))
+        st.session_state.lidar_figure = cached
+    return cached[1]
+
+
 def plot_lidar_scan(points: np.ndarray, walls=None) -> go.Figure:
     """Plot 2D RPLIDAR scan with detected walls."""
     fig = go.Figure()
     
-    # Plot raw points
-    fig.add_trace(go.Scatter(
+    # Plot raw points (WebGL once the scan gets dense)
+    scatter = go.Scattergl if len(points) > 1000 else go.Scatter
+    fig.add_trace(scatter(
         x=points[:, 0],
         y=points[:, 1],
         mode='markers',
@@ -229,6 +246,7 @@ def plot_lidar_scan(points: np.ndarray, walls=None) -> go.Figure:
         yaxis=dict(scaleanchor="x", scaleratio=1),
         template="plotly_dark",
         margin=dict(l=50, r=20, t=20, b=50),
+        uirevision='lidar',
     )
     
     return fig
@@ -236,12 +254,6 @@ def plot_lidar_scan(points: np.ndarray, walls=None) -> go.Figure:
 
 def plot_depth_cloud_2d(points: np.ndarray, view: str) -> go.Figure:
     """Plot point cloud in 2D projection."""
-    # Subsample for performance
-    max_points = 10000
-    if len(points) > max_points:
-        idx = np.random.choice(len(points), max_points, replace=False)
-        points = points[idx]
-    
     x, y, z = points[:, 0], points[:, 1], points[:, 2]
     
     if view == "Front (Y vs X)":
@@ -260,9 +272,19 @@ def plot_depth_cloud_2d(points: np.ndarray, view: str) -> go.Figure:
         x_label, y_label = "Z (m) - Depth", "Y (m) - Height"
         color_label = "X (m)"
     
-    fig = go.Figure(data=go.Scatter(
-        x=plot_x, 
-        y=plot_y,
+    # Subsample for performance
+    max_points = 10000
+    if len(points) > max_points:
+        idx = _voxel_indices(plot_x, plot_y, voxel=0.02)
+        if len(idx) > max_points:
+            # Unique picks without shuffling; avoids duplicate markers
+            rng = np.random.default_rng()
+            idx = idx[rng.choice(len(idx), max_points, replace=False, shuffle=False)]
+        plot_x, plot_y, color_data = plot_x[idx], plot_y[idx], color_data[idx]
+    
+    fig = go.Figure(data=go.Scattergl(
+        x=plot_x.astype(np.float32, copy=False), 
+        y=plot_y.astype(np.float32, copy=False),
         mode='markers',
         marker=dict(
             size=3,
@@ -280,10 +302,21 @@ def plot_depth_cloud_2d(points: np.ndarray, view: str) -> go.Figure:
         yaxis=dict(scaleanchor="x", scaleratio=1),
         template="plotly_dark",
         margin=dict(l=50, r=20, t=20, b=50),
+        uirevision=view,
     )
     
     return fig
 
 
+def _voxel_indices(plot_x: np.ndarray, plot_y: np.ndarray, voxel: float) -> np.ndarray:
+    """Indices of one point per occupied voxel cell in the projected plane."""
+    cells = np.empty((len(plot_x), 2), dtype=np.int32)
+    cells[:, 0] = np.floor(plot_x / voxel)
+    cells[:, 1] = np.floor(plot_y / voxel)
+    keys = cells.view(np.int64).ravel()
+    _, idx = np.unique(keys, return_index=True)
+    return idx
+
+
 if __name__ == "__main__":
     main()
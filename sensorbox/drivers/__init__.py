@@ -1,17 +1,31 @@
 """Sensor drivers for SensorBox SDK."""
 
-from .camera import ArducamSensor
-from .csi_camera import CSICamera, list_resolutions
-from .multi_camera import MultiCamera, MultiFrame
-from .rplidar import RPLidarSensor, discover_rplidars
-from .sensor_fusion import SensorFusion, FusedFrame
-from .oakd import OakDPro, OakDFrame, discover_oakd_devices
+import importlib
+
+# Drivers are imported on first attribute access so that using one driver
+# does not pay for the others' SDKs (depthai for OAK-D, pyserial for RPLIDAR).
+_LAZY = {
+    "ArducamSensor": "camera",
+    "CSICamera": "csi_camera",
+    "list_resolutions": "csi_camera",
+    "MultiCamera": "multi_camera",
+    "MultiFrame": "multi_camera",
+    "ProcessCSICamera": "process_camera",
+    "RPLidarSensor": "rplidar",
+    "discover_rplidars": "rplidar",
+    "SensorFusion": "sensor_fusion",
+    "FusedFrame": "sensor_fusion",
+    "OakDPro": "oakd",
+    "OakDFrame": "oakd",
+    "discover_oakd_devices": "oakd",
+}
 
 __all__ = [
     "ArducamSensor",
     "CSICamera",
     "MultiCamera",
     "MultiFrame",
+    "ProcessCSICamera",
     "RPLidarSensor",
     "discover_rplidars",
     "SensorFusion",
@@ -21,3 +35,16 @@ __all__ = [
     "discover_oakd_devices",
     "list_resolutions",
 ]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_LAZY[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,91 @@
+"""Scan preprocessing kernels for the LIDAR drivers."""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to NumPy
+    njit = None
+
+
+# Bytes per measurement packet in the standard (non-express) scan mode
+PACKET_SIZE = 5
+
+
+if njit is not None:
+    @njit(cache=True, boundscheck=False)
+    def _parse_packets_kernel(packets, out, new_scan):
+        for i in range(packets.shape[0]):
+            b0 = packets[i, 0]
+            b1 = packets[i, 1]
+            start = b0 & 1
+            if start == (b0 >> 1) & 1 or b1 & 1 != 1:
+                return i
+            out[i, 0] = b0 >> 2
+            out[i, 1] = ((b1 >> 1) | (np.uint16(packets[i, 2]) << 7)) / 64.0
+            out[i, 2] = (packets[i, 3] | (np.uint16(packets[i, 4]) << 8)) / 4.0
+            new_scan[i] = start == 1
+        return packets.shape[0]
+    
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def _scan_to_xyzq_kernel(raw, out):
+        n = 0
+        for i in range(raw.shape[0]):
+            d = raw[i, 2]
+            if d <= 0.0:
+                continue
+            a = np.deg2rad(raw[i, 1])
+            out[n, 0] = d * np.cos(a)
+            out[n, 1] = d * np.sin(a)
+            out[n, 2] = 0.0
+            out[n, 3] = raw[i, 0]
+            n += 1
+        return n
+
+
+def scan_to_xyzq(raw: np.ndarray, out: np.ndarray) -> int:
+    """Convert polar scan rows to cartesian points.
+
+    ``raw`` is an Nx3 float32 array of (quality, angle_deg, distance_mm) rows
+    as the device reports them; ``out`` is an Nx4 float32 buffer that
+    receives (x_mm, y_mm, z_mm=0, quality) for every point with a positive
+    distance, packed at the front. Returns the number of points written.
+    """
+    if njit is not None:
+        return _scan_to_xyzq_kernel(raw, out)
+
+    valid = raw[raw[:, 2] > 0]
+    n = len(valid)
+    angles = np.deg2rad(valid[:, 1])
+    np.multiply(valid[:, 2], np.cos(angles), out=out[:n, 0])
+    np.multiply(valid[:, 2], np.sin(angles), out=out[:n, 1])
+    out[:n, 2] = 0.0
+    out[:n, 3] = valid[:, 0]
+    return n
+
+
+def parse_packets(packets: np.ndarray, out: np.ndarray, new_scan: np.ndarray) -> int:
+    """Decode standard-mode RPLIDAR measurement packets.
+
+    ``packets`` is an Nx5 uint8 array of raw packets; ``out`` (Nx3 float32)
+    receives (quality, angle_deg, distance_mm) rows in the order the
+    ``rplidar`` package yields them, and ``new_scan`` (N bool) the
+    start-of-rotation flag. Returns the number of packets decoded, which
+    stops short of N at the first packet whose start or check bits are
+    inconsistent (the byte stream has lost sync).
+    """
+    if njit is not None:
+        return _parse_packets_kernel(packets, out, new_scan)
+
+    b0 = packets[:, 0]
+    b1 = packets[:, 1]
+    start = b0 & 1
+    bad = (start == (b0 >> 1) & 1) | (b1 & 1 != 1)
+    n = int(np.argmax(bad)) if bad.any() else len(packets)
+
+    b0, b1, start = b0[:n], b1[:n], start[:n]
+    out[:n, 0] = b0 >> 2
+    out[:n, 1] = ((b1 >> 1) | (packets[:n, 2].astype(np.uint16) << 7)) / 64.0
+    out[:n, 2] = (packets[:n, 3] | (packets[:n, 4].astype(np.uint16) << 8)) / 4.0
+    new_scan[:n] = start == 1
+    return n
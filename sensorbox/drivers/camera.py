@@ -6,6 +6,8 @@ video capture interfaces. This driver uses OpenCV's VideoCapture
 for cross-platform compatibility.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from typing import Optional, List
 import cv2
 import numpy as np
@@ -18,6 +20,10 @@ from ..core.frame import (
     FrameType,
 )
 
+# Shared read-only metadata for the usual 8-bit frames (no per-frame dict)
+_BGR_METADATA = MappingProxyType({"format": "BGR", "dtype": "uint8"})
+_RGB_METADATA = MappingProxyType({"format": "RGB", "dtype": "uint8"})
+
 
 class ArducamSensor(Sensor):
     """
@@ -61,6 +67,7 @@ class ArducamSensor(Sensor):
         self._actual_width: int = 0
         self._actual_height: int = 0
         self._actual_fps: float = 0.0
+        self._rgb_buffer: Optional[np.ndarray] = None
     
     @property
     def width(self) -> int:
@@ -87,6 +94,12 @@ class ArducamSensor(Sensor):
             device = self._device_path or f"index {self._device_index}"
             raise ConnectionError(f"Failed to open camera: {device}")
         
+        # MJPG is compressed on the camera, so it needs far less USB
+        # bandwidth than YUYV; a one-frame driver buffer avoids reading
+        # stale frames. Backends that don't support these ignore them.
+        self._capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        self._capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self._capture.set(cv2.CAP_PROP_CONVERT_RGB, 1)
         self._capture.set(cv2.CAP_PROP_FRAME_WIDTH, self._requested_width)
         self._capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self._requested_height)
         self._capture.set(cv2.CAP_PROP_FPS, self._requested_fps)
@@ -94,6 +107,9 @@ class ArducamSensor(Sensor):
         self._actual_width = int(self._capture.get(cv2.CAP_PROP_FRAME_WIDTH))
         self._actual_height = int(self._capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
         self._actual_fps = self._capture.get(cv2.CAP_PROP_FPS)
+        self._rgb_buffer = np.empty(
+            (self._actual_height, self._actual_width, 3), dtype=np.uint8
+        )
         
         self._metadata = SensorMetadata(
             sensor_id=self._sensor_id,
@@ -117,6 +133,7 @@ class ArducamSensor(Sensor):
         if self._capture is not None:
             self._capture.release()
             self._capture = None
+        self._rgb_buffer = None
         self._connected = False
     
     def read(self) -> Optional[SensorFrame]:
@@ -138,18 +155,26 @@ class ArducamSensor(Sensor):
             wall_time=wall_time,
             sequence_number=self._next_sequence(),
             data=frame,
-            metadata={
-                "format": "BGR",
-                "dtype": str(frame.dtype),
-            },
+            metadata=(
+                _BGR_METADATA if frame.dtype == np.uint8
+                else {"format": "BGR", "dtype": str(frame.dtype)}
+            ),
         )
     
     def read_rgb(self) -> Optional[SensorFrame]:
+        """
+        Read a frame converted to RGB.
+        
+        The returned data is written into a buffer owned by the camera and
+        is overwritten by the next read_rgb() call; copy it to keep it.
+        """
         frame = self.read()
         if frame is None:
             return None
         
-        rgb_data = cv2.cvtColor(frame.data, cv2.COLOR_BGR2RGB)
+        if self._rgb_buffer is None or self._rgb_buffer.shape != frame.data.shape:
+            self._rgb_buffer = np.empty_like(frame.data)
+        rgb_data = cv2.cvtColor(frame.data, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer)
         
         return SensorFrame(
             sensor_id=frame.sensor_id,
@@ -159,24 +184,37 @@ class ArducamSensor(Sensor):
             wall_time=frame.wall_time,
             sequence_number=frame.sequence_number,
             data=rgb_data,
-            metadata={"format": "RGB", "dtype": str(rgb_data.dtype)},
+            metadata=(
+                _RGB_METADATA if rgb_data.dtype == np.uint8
+                else {"format": "RGB", "dtype": str(rgb_data.dtype)}
+            ),
         )
 
 
+def _probe_camera(index: int) -> Optional[dict]:
+    cap = cv2.VideoCapture(index)
+    try:
+        if not cap.isOpened():
+            return None
+        return {
+            "device_index": index,
+            "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "fps": cap.get(cv2.CAP_PROP_FPS),
+            "backend": cap.getBackendName(),
+        }
+    finally:
+        cap.release()
+
+
 def discover_cameras(max_index: int = 10) -> List[dict]:
-    """Discover available cameras by probing device indices."""
-    cameras = []
+    """Discover available cameras by probing device indices in parallel."""
+    if max_index <= 0:
+        return []
     
-    for i in range(max_index):
-        cap = cv2.VideoCapture(i)
-        if cap.isOpened():
-            cameras.append({
-                "device_index": i,
-                "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
-                "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
-                "fps": cap.get(cv2.CAP_PROP_FPS),
-                "backend": cap.getBackendName(),
-            })
-            cap.release()
+    # Opening a device blocks in the driver with the GIL released, so
+    # probing concurrently costs roughly one open instead of max_index
+    with ThreadPoolExecutor(max_workers=max_index) as executor:
+        results = executor.map(_probe_camera, range(max_index))
     
-    return cameras
+    return [info for info in results if info is not None]
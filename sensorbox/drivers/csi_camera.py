@@ -1,9 +1,23 @@
 """CSI Camera Driver for NVIDIA Jetson with buffer flush."""
 
-from typing import Optional, Generator
+from collections import deque
+from enum import Enum
+from types import MappingProxyType
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Generator
+import os
+import queue
+import sys
+import threading
 import time
 import cv2
 import logging
+import numpy as np
+
+try:
+    import cupy as cp
+except ImportError:  # cupy is optional; frame buffers stay in pageable memory
+    cp = None
 
 from ..core.sensor import Sensor
 from ..core.frame import SensorFrame, SensorMetadata, SensorType, FrameType
@@ -17,6 +31,19 @@ RESOLUTIONS = {
     "480p": (640, 480, 90),
 }
 
+# Number of BGRx capture buffers recycled by the capture thread
+FRAME_POOL_SIZE = 5
+
+# How long read() waits for the capture thread before returning None
+READ_TIMEOUT = 1.0
+
+# Payload of frames yielded by stream(decode=False)
+_UNDECODED = np.empty((0, 0, 3), dtype=np.uint8)
+
+# Per-frame metadata never changes, so every frame shares one read-only mapping
+_BGR_METADATA = MappingProxyType({"format": "BGR"})
+_UNDECODED_METADATA = MappingProxyType({"decoded": False})
+
 
 class CameraError(Exception):
     pass
@@ -28,8 +55,47 @@ class CameraReadError(CameraError):
     pass
 
 
+class FrameStatus(Enum):
+    """Outcome of polling the capture thread for a frame."""
+    OK = "ok"
+    DROPPED = "dropped"    # nothing arrived within READ_TIMEOUT
+    TERMINAL = "terminal"  # capture stopped; no more frames will arrive
+
+
+def _alloc_frame_buffer(shape: tuple, pinned: bool) -> np.ndarray:
+    """Allocate a uint8 frame buffer, page-locked through CuPy when pinned."""
+    if not pinned:
+        return np.empty(shape, dtype=np.uint8)
+    nbytes = int(np.prod(shape))
+    mem = cp.cuda.alloc_pinned_memory(nbytes)
+    return np.frombuffer(mem, dtype=np.uint8, count=nbytes).reshape(shape)
+
+
+def _cuda_available() -> bool:
+    """True when OpenCV was built with CUDA and sees a device."""
+    try:
+        return hasattr(cv2, "cuda") and cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except cv2.error:
+        return False
+
+
 class CSICamera(Sensor):
-    """CSI camera driver with buffer flushing."""
+    """
+    CSI camera driver with buffer flushing.
+    
+    A background thread grabs, decodes and wraps frames while connected;
+    read() only hands over the newest one. Frames returned by read() are
+    BGR views into a pool of FRAME_POOL_SIZE preallocated buffers. Copy
+    frame.data if it must outlive FRAME_POOL_SIZE - 2 subsequent reads.
+    
+    With use_cuda (auto-detected when None) nvvidconv emits NV12 and the
+    NV12 -> BGR conversion runs on the GPU; otherwise nvvidconv emits BGRx
+    and the pad byte is skipped by a strided view.
+    
+    With pinned_memory (needs cupy) the pool is page-locked host memory,
+    so uploading frame.data to the GPU is a direct DMA (zero-copy on
+    Jetson's integrated GPU) instead of a staged pageable copy.
+    """
     
     def __init__(
         self,
@@ -44,6 +110,10 @@ class CSICamera(Sensor):
         reconnect_delay: float = 1.0,
         max_consecutive_failures: int = 10,
         flush_frames: int = 5,  # Number of frames to discard on connect
+        use_cuda: Optional[bool] = None,
+        pinned_memory: bool = False,
+        # SCHED_FIFO priority for the capture thread (Linux)
+        realtime_priority: Optional[int] = None,
     ):
         if resolution:
             if resolution not in RESOLUTIONS:
@@ -56,6 +126,13 @@ class CSICamera(Sensor):
         self._fps = fps
         self._flip_method = flip_method
         self._flush_frames = flush_frames
+        self._cuda_convert = _cuda_available() if use_cuda is None else use_cuda
+        if pinned_memory and cp is None:
+            logger.warning("pinned_memory requires cupy; using pageable frame buffers")
+        self._pinned_memory = pinned_memory and cp is not None
+        self._realtime_priority = realtime_priority
+        # Geometry is fixed for the lifetime of the instance
+        self._pipeline = self._build_gstreamer_pipeline()
         
         self._auto_reconnect = auto_reconnect
         self._max_reconnect_attempts = max_reconnect_attempts
@@ -71,15 +148,39 @@ class CSICamera(Sensor):
             sensor_type=SensorType.CAMERA
         )
         self._capture = None
+        
+        # Constant per-frame fields, resolved once instead of per frame
+        self._frame_sensor_id = sys.intern(self._sensor_id)
+        self._frame_sensor_type = SensorType.CAMERA
+        self._frame_type = FrameType.IMAGE
+        
+        self._frame_pool: list[np.ndarray] = []
+        self._nv12_frame: Optional[np.ndarray] = None
+        self._gpu_nv12 = None
+        self._gpu_bgr = None
+        
+        self._capture_thread: Optional[threading.Thread] = None
+        self._frame_queue: queue.Queue = queue.Queue(maxsize=1)
+        self._stop_event = threading.Event()
+        self._capture_error: Optional[CameraReadError] = None
+        
+        # Grab-only mode used by stream(decode=False) and warmup()
+        self._decode_frames = True
+        self._grab_count = 0
+        self._grab_cond = threading.Condition()
     
     def _build_gstreamer_pipeline(self) -> str:
+        # nvvidconv (VIC hardware) does the NVMM -> system memory copy and
+        # the flip; colour conversion happens in the capture thread instead
+        # of in a CPU videoconvert element.
+        pixel_format = "NV12" if self._cuda_convert else "BGRx"
         return (
             f"nvarguscamerasrc sensor-id={self._csi_sensor_id} ! "
             f"video/x-raw(memory:NVMM), width={self._width}, height={self._height}, "
             f"framerate={self._fps}/1 ! "
             f"nvvidconv flip-method={self._flip_method} ! "
-            f"video/x-raw, width={self._width}, height={self._height}, format=BGRx ! "
-            f"videoconvert ! video/x-raw, format=BGR ! appsink drop=1"
+            f"video/x-raw, width={self._width}, height={self._height}, format={pixel_format} ! "
+            f"appsink drop=1 max-buffers=1 sync=false"
         )
     
     @property
@@ -96,7 +197,7 @@ class CSICamera(Sensor):
     
     @property
     def gstreamer_pipeline(self) -> str:
-        return self._build_gstreamer_pipeline()
+        return self._pipeline
     
     @property
     def stats(self) -> dict:
@@ -125,17 +226,7 @@ class CSICamera(Sensor):
         )
     
     def _do_connect(self) -> None:
-        pipeline = self._build_gstreamer_pipeline()
-        self._capture = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
-        
-        if not self._capture.isOpened():
-            raise CameraConnectionError(
-                f"Failed to open CSI camera {self._csi_sensor_id}"
-            )
-        
-        # FLUSH OLD FRAMES FROM BUFFER
-        for _ in range(self._flush_frames):
-            self._capture.read()
+        self._open_capture()
         
         self._metadata = SensorMetadata(
             sensor_id=self._sensor_id,
@@ -154,8 +245,64 @@ class CSICamera(Sensor):
         self._sequence_number = 0
         self._time_offset = None
         self._consecutive_failures = 0
+        self._capture_error = None
+        self._frame_queue = queue.Queue(maxsize=1)
+        
+        self._stop_event.clear()
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._capture_thread.start()
+    
+    def _open_capture(self) -> None:
+        self._capture = cv2.VideoCapture(self._pipeline, cv2.CAP_GSTREAMER)
+        self._capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        
+        if not self._capture.isOpened():
+            raise CameraConnectionError(
+                f"Failed to open CSI camera {self._csi_sensor_id}"
+            )
+        
+        # Buffers survive reopen; pinned allocations are expensive
+        channels = 3 if self._cuda_convert else 4
+        nv12_rows = self._height * 3 // 2
+        if not self._frame_pool:
+            self._frame_pool = [
+                _alloc_frame_buffer((self._height, self._width, channels), self._pinned_memory)
+                for _ in range(FRAME_POOL_SIZE)
+            ]
+        if self._cuda_convert:
+            if self._nv12_frame is None:
+                self._nv12_frame = _alloc_frame_buffer(
+                    (nv12_rows, self._width), self._pinned_memory
+                )
+            self._gpu_nv12 = cv2.cuda_GpuMat(nv12_rows, self._width, cv2.CV_8UC1)
+            self._gpu_bgr = cv2.cuda_GpuMat(self._height, self._width, cv2.CV_8UC3)
+        
+        # FLUSH OLD FRAMES FROM BUFFER (grab only, nothing to decode)
+        for _ in range(self._flush_frames):
+            self._capture.grab()
+    
+    def _reopen_capture(self) -> bool:
+        """Reopen the pipeline from the capture thread."""
+        for attempt in range(self._max_reconnect_attempts):
+            if self._stop_event.is_set():
+                return False
+            if self._capture:
+                self._capture.release()
+                self._capture = None
+            try:
+                self._open_capture()
+                return True
+            except CameraConnectionError:
+                if attempt < self._max_reconnect_attempts - 1:
+                    self._stop_event.wait(self._reconnect_delay)
+        return False
     
     def disconnect(self) -> None:
+        self._stop_event.set()
+        if self._capture_thread:
+            self._capture_thread.join(timeout=2.0)
+            self._capture_thread = None
+        
         if self._capture:
             self._capture.release()
             self._capture = None
@@ -169,79 +316,298 @@ class CSICamera(Sensor):
         except CameraConnectionError:
             return False
     
-    def read(self) -> Optional[SensorFrame]:
-        if not self._connected:
-            raise RuntimeError(f"Camera {self._sensor_id} is not connected")
+    def _grab(self) -> bool:
+        """Advance to the next frame without decoding it."""
+        return self._capture.grab()
+    
+    def _retrieve(self, dst: np.ndarray):
+        """Decode the most recently grabbed frame into dst."""
+        return self._capture.retrieve(dst)
+    
+    def _capture_raw(
+        self, dst: np.ndarray, grabbed: Optional[bool] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Grab and decode one frame, handling failures and reconnection.
         
-        ret, frame = self._capture.read()
+        Pass grabbed to decode a frame whose grab() was already issued.
+        """
+        ret, raw = False, None
+        if self._grab() if grabbed is None else grabbed:
+            ret, raw = self._retrieve(dst)
         
-        if not ret or frame is None:
-            self._consecutive_failures += 1
-            self._dropped_frames += 1
-            
-            if self._consecutive_failures >= self._max_consecutive_failures:
-                if self._auto_reconnect:
-                    if self.reconnect():
-                        self._consecutive_failures = 0
-                        return self.read()
-                    else:
-                        raise CameraReadError(f"Camera {self._csi_sensor_id} failed")
-                else:
-                    raise CameraReadError(f"Camera {self._csi_sensor_id} exceeded max failures")
-            
+        if not ret or raw is None:
+            self._record_failure()
             return None
         
         self._consecutive_failures = 0
         self._total_frames += 1
+        return raw
+    
+    def _grab_only(self) -> None:
+        """Advance the stream without decoding and wake stream(decode=False)."""
+        if not self._grab():
+            self._record_failure()
+            return
+        
+        self._consecutive_failures = 0
+        self._total_frames += 1
+        with self._grab_cond:
+            self._grab_count += 1
+            self._grab_cond.notify_all()
+    
+    def _record_failure(self) -> None:
+        self._consecutive_failures += 1
+        self._dropped_frames += 1
+        
+        if self._consecutive_failures >= self._max_consecutive_failures:
+            if not self._auto_reconnect:
+                self._capture_error = CameraReadError(
+                    f"Camera {self._csi_sensor_id} exceeded max failures"
+                )
+            elif self._reopen_capture():
+                self._consecutive_failures = 0
+                return
+            else:
+                self._capture_error = CameraReadError(f"Camera {self._csi_sensor_id} failed")
+            self._stop_event.set()
+    
+    def _convert_nv12(self, raw: np.ndarray, dst: np.ndarray) -> np.ndarray:
+        if self._gpu_nv12 is not None:
+            try:
+                self._gpu_nv12.upload(raw)
+                cv2.cuda.cvtColor(self._gpu_nv12, cv2.COLOR_YUV2BGR_NV12, dst=self._gpu_bgr)
+                return self._gpu_bgr.download(dst)
+            except cv2.error as e:
+                logger.warning(f"CUDA NV12 conversion unavailable, using CPU: {e}")
+                self._gpu_nv12 = self._gpu_bgr = None
+        return cv2.cvtColor(raw, cv2.COLOR_YUV2BGR_NV12, dst=dst)
+    
+    def _build_frame(self, raw: np.ndarray, slot: np.ndarray) -> SensorFrame:
+        frame = raw
+        if self._cuda_convert:
+            frame = self._convert_nv12(raw, slot)
+        elif raw.ndim == 3 and raw.shape[2] == 4:
+            frame = raw[..., :3]  # BGR view, the pad byte is skipped by stride
         
         timestamp, wall_time = self._get_timestamp()
         return SensorFrame(
-            sensor_id=self._sensor_id,
-            sensor_type=SensorType.CAMERA,
-            frame_type=FrameType.IMAGE,
+            sensor_id=self._frame_sensor_id,
+            sensor_type=self._frame_sensor_type,
+            frame_type=self._frame_type,
             timestamp=timestamp,
             wall_time=wall_time,
-            sequence_number=self._next_sequence(),
+            sequence_number=0,  # assigned on delivery in read()
             data=frame,
-            metadata={"format": "BGR"},
+            metadata=_BGR_METADATA,
+        )
+    
+    def _set_realtime_priority(self, priority: int) -> None:
+        # On Linux pid 0 is the calling thread, not the whole process
+        if not hasattr(os, "sched_setscheduler"):
+            logger.warning("realtime_priority is only supported on Linux")
+            return
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+        except OSError as e:
+            logger.warning(f"{self._sensor_id}: could not set SCHED_FIFO priority {priority}: {e}")
+    
+    def _capture_loop(self) -> None:
+        """Background thread: keep the newest frame ready for read()."""
+        if self._realtime_priority is not None:
+            self._set_realtime_priority(self._realtime_priority)
+        
+        # Everything below is fixed for the connection; bind it once so the
+        # per-frame path does local lookups instead of instance/global ones.
+        stop_is_set = self._stop_event.is_set
+        capture_raw = self._capture_raw
+        build_frame = self._build_frame
+        grab_only = self._grab_only
+        get_nowait = self._frame_queue.get_nowait
+        put_nowait = self._frame_queue.put_nowait
+        empty = queue.Empty
+        pool = self._frame_pool
+        pool_size = len(pool)
+        # Where each slot's pixels are retrieved to before conversion
+        capture_dst = [self._nv12_frame] * pool_size if self._cuda_convert else pool
+        
+        # Slots that are neither being written nor queued, least recently
+        # delivered first. A delivered slot joins the back, so it is not
+        # written again until FRAME_POOL_SIZE - 2 later frames are delivered.
+        free = deque(range(1, pool_size))
+        spare = 0
+        queued = None
+        
+        # grab() for frame N+1 runs on this helper while frame N is converted
+        # and published. VideoCapture keeps one grabbed sample, so the next
+        # grab is only issued once retrieve() has finished with the current one.
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="csi-grab") as grabber:
+            next_grab: Optional[Future] = None
+            
+            while not stop_is_set():
+                if not self._decode_frames:
+                    if next_grab is not None:
+                        next_grab.result()
+                        next_grab = None
+                    # A frame decoded before grab-only mode would be stale once
+                    # decoding resumes; drop it and free its slot
+                    if queued is not None:
+                        try:
+                            get_nowait()
+                            free.appendleft(queued)
+                        except empty:
+                            free.append(queued)
+                        queued = None
+                    grab_only()
+                    continue
+                
+                grabbed = next_grab.result() if next_grab is not None else None
+                raw = capture_raw(capture_dst[spare], grabbed)
+                if raw is None:
+                    next_grab = None
+                    continue
+                next_grab = grabber.submit(self._grab)
+                frame = build_frame(raw, pool[spare])
+                
+                # An undelivered frame is replaced and its slot is reused first.
+                # Otherwise the consumer took it, so the slot waits its turn.
+                try:
+                    get_nowait()
+                    reclaimed = True
+                except empty:
+                    reclaimed = False
+                
+                put_nowait(frame)
+                if queued is not None:
+                    if reclaimed:
+                        free.appendleft(queued)
+                    else:
+                        free.append(queued)
+                queued = spare
+                spare = free.popleft()
+    
+    def read(self) -> Optional[SensorFrame]:
+        if not self._connected:
+            raise RuntimeError(f"Camera {self._sensor_id} is not connected")
+        
+        status, frame = self._poll()
+        if status is FrameStatus.TERMINAL:
+            raise self._capture_error or RuntimeError(
+                f"Camera {self._sensor_id} is not connected"
+            )
+        return frame
+    
+    def _poll(self) -> tuple[FrameStatus, Optional[SensorFrame]]:
+        """Exception-free read() used by stream()."""
+        if self._stop_event.is_set() and self._frame_queue.empty():
+            return FrameStatus.TERMINAL, None
+        
+        try:
+            frame = self._frame_queue.get(timeout=READ_TIMEOUT)
+        except queue.Empty:
+            if self._stop_event.is_set():
+                return FrameStatus.TERMINAL, None
+            return FrameStatus.DROPPED, None
+        
+        frame.sequence_number = self._next_sequence()
+        return FrameStatus.OK, frame
+    
+    def _poll_undecoded(self) -> tuple[FrameStatus, Optional[SensorFrame]]:
+        """Wait for the next grab-only frame and describe it without pixels."""
+        with self._grab_cond:
+            seen = self._grab_count
+            self._grab_cond.wait_for(
+                lambda: self._grab_count != seen or self._stop_event.is_set(),
+                timeout=READ_TIMEOUT,
+            )
+            grabbed = self._grab_count != seen
+        if not grabbed:
+            if self._stop_event.is_set():
+                return FrameStatus.TERMINAL, None
+            return FrameStatus.DROPPED, None
+        
+        timestamp, wall_time = self._get_timestamp()
+        return FrameStatus.OK, SensorFrame(
+            sensor_id=self._frame_sensor_id,
+            sensor_type=self._frame_sensor_type,
+            frame_type=self._frame_type,
+            timestamp=timestamp,
+            wall_time=wall_time,
+            sequence_number=self._next_sequence(),
+            data=_UNDECODED,
+            metadata=_UNDECODED_METADATA,
         )
     
+    def warmup(self, n_frames: Optional[int] = None) -> None:
+        """Run the sensor for n_frames (default flush_frames) without decoding."""
+        n_frames = self._flush_frames if n_frames is None else n_frames
+        for _ in self.stream(max_frames=n_frames, decode=False):
+            pass
+    
     def stream(
         self,
         duration: Optional[float] = None,
         max_frames: Optional[int] = None,
         target_fps: Optional[float] = None,
+        decode: bool = True,
     ) -> Generator[SensorFrame, None, None]:
+        """
+        Yield frames until duration, max_frames or a read error ends the stream.
+        
+        With decode=False the capture thread only grabs; frames carry an
+        empty payload and metadata {"decoded": False}. Useful for warm-up,
+        exposure priming and drop measurements. A decoded frame still queued
+        when the stream starts is dropped, so the next read() is fresh.
+        """
         if not self._connected:
             raise RuntimeError(f"Sensor {self._sensor_id} is not connected")
         
-        start_time = time.monotonic()
+        self._decode_frames = decode
+        poll = self._poll if decode else self._poll_undecoded
+        try:
+            yield from self._stream(poll, duration, max_frames, target_fps)
+        finally:
+            self._decode_frames = True
+    
+    def _stream(
+        self,
+        poll: Callable[[], tuple[FrameStatus, Optional[SensorFrame]]],
+        duration: Optional[float],
+        max_frames: Optional[int],
+        target_fps: Optional[float],
+    ) -> Generator[SensorFrame, None, None]:
+        # Integer nanoseconds, one clock read per iteration
+        start_ns = time.monotonic_ns()
+        duration_ns = int(duration * 1e9) if duration is not None else None
+        interval_ns = int(1e9 / target_fps) if target_fps else None
+        last_frame_ns = start_ns - (interval_ns or 0)
         frame_count = 0
-        frame_interval = 1.0 / target_fps if target_fps else None
-        last_frame_time = 0.0
         
         while True:
-            if duration is not None:
-                if time.monotonic() - start_time >= duration:
-                    break
+            now_ns = time.monotonic_ns()
+            if duration_ns is not None and now_ns - start_ns >= duration_ns:
+                break
             
             if max_frames is not None and frame_count >= max_frames:
                 break
             
-            if frame_interval is not None:
-                current_time = time.monotonic()
-                if current_time - last_frame_time < frame_interval:
-                    time.sleep(0.001)
-                    continue
+            if interval_ns is not None:
+                wait_ns = interval_ns - (now_ns - last_frame_ns)
+                if wait_ns > 0:
+                    # Block until the frame is due; the capture thread sets the
+                    # stop event on disconnect or terminal failure, which ends
+                    # the wait early and falls through to poll() to report it.
+                    # After a plain timeout poll() blocks on the frame queue.
+                    if not self._stop_event.wait(wait_ns / 1e9):
+                        continue
             
-            try:
-                frame = self.read()
-                if frame is not None:
-                    frame_count += 1
-                    last_frame_time = time.monotonic()
-                    yield frame
-            except CameraReadError:
+            status, frame = poll()
+            if status is FrameStatus.TERMINAL:
                 break
+            if frame is not None:
+                frame_count += 1
+                last_frame_ns = now_ns
+                yield frame
 
 
 def list_resolutions() -> dict:
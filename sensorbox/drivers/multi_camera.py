@@ -1,34 +1,47 @@
 """Multi-camera streaming for NVIDIA Jetson."""
 
-from typing import Optional, List, Dict, Generator
+from typing import Callable, Optional, List, Dict, Generator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from datetime import datetime
 import threading
 import queue
 import time
 
 from .csi_camera import CSICamera
+from .process_camera import ProcessCSICamera
 from ..core.frame import SensorFrame
 
 
-@dataclass
+@dataclass(slots=True)
 class MultiFrame:
     """A synchronized frame from multiple cameras."""
     timestamp: float
     wall_time: datetime
-    frames: Dict[int, SensorFrame]  # sensor_id -> frame
+    ids: tuple[int, ...]  # sensor ids, fixed at connect
+    frames: tuple[Optional[SensorFrame], ...]  # aligned with ids; None if a camera had no frame
+    sync_skew_ns: int = 0  # wall-clock spread between the earliest and latest frame
     
     def __getitem__(self, sensor_id: int) -> Optional[SensorFrame]:
-        return self.frames.get(sensor_id)
+        # Linear scan; faster than hashing for the 2-4 cameras a Jetson takes
+        try:
+            return self.frames[self.ids.index(sensor_id)]
+        except ValueError:
+            return None
     
     def __len__(self) -> int:
-        return len(self.frames)
+        return sum(f is not None for f in self.frames)
 
 
 class MultiCamera:
     """
     Stream from multiple CSI cameras simultaneously.
     
+    Each camera already captures on its own thread (or worker process)
+    into a latest-only slot, so a slow consumer drops frames rather than
+    falling behind; read() collects every camera's newest frame at once.
+    
     Example:
         with MultiCamera([0, 1]) as cams:
             for multi_frame in cams.stream(duration=5.0):
@@ -43,6 +56,8 @@ class MultiCamera:
         width: int = 1280,
         height: int = 720,
         fps: int = 30,
+        backend: str = "thread",
+        sync_warmup_frames: int = 5,
     ):
         """
         Initialize multi-camera capture.
@@ -52,12 +67,29 @@ class MultiCamera:
             width: Capture width for all cameras
             height: Capture height for all cameras
             fps: Capture FPS for all cameras
+            backend: "thread" captures every camera in this process;
+                "process" gives each camera a worker process and shares
+                frames through shared memory, so cameras do not contend
+                for the GIL. Process-backed frames are valid until the
+                next read().
+            sync_warmup_frames: Reads per camera at connect used to measure
+                each camera's read latency; faster cameras are then started
+                later so all frames land closer together. 0 disables this.
         """
+        if backend not in ("thread", "process"):
+            raise ValueError(f"Unknown backend '{backend}'. Options: ['thread', 'process']")
+        
         self._sensor_ids = sensor_ids
         self._width = width
         self._height = height
         self._fps = fps
-        self._cameras: Dict[int, CSICamera] = {}
+        self._backend = backend
+        self._sync_warmup_frames = sync_warmup_frames
+        self._read_offsets: Dict[int, float] = {}
+        self._cameras: Dict[int, CSICamera | ProcessCSICamera] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._ids: tuple[int, ...] = ()
+        self._readers: tuple[Callable[[], Optional[SensorFrame]], ...] = ()
         self._connected = False
     
     @property
@@ -73,23 +105,79 @@ class MultiCamera:
         if self._connected:
             return
         
-        for sid in self._sensor_ids:
-            cam = CSICamera(
-                sensor_id=sid,
-                width=self._width,
-                height=self._height,
-                fps=self._fps,
-            )
-            cam.connect()
-            self._cameras[sid] = cam
+        # One worker per camera, so connect() and each read() wait on every
+        # camera at once; pipeline startup takes seconds per camera
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, len(self._sensor_ids)), thread_name_prefix="cam"
+        )
+        futures = [self._pool.submit(self._connect_one, sid) for sid in self._sensor_ids]
+        
+        error = None
+        for sid, future in zip(self._sensor_ids, futures):
+            try:
+                self._cameras[sid] = future.result()
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            self.disconnect()
+            raise error
         
+        self._read_offsets = self._measure_read_offsets()
+        
+        self._ids = tuple(self._cameras)
+        self._readers = tuple(
+            partial(self._delayed_read, cam, self._read_offsets[sid])
+            if sid in self._read_offsets else cam.read
+            for sid, cam in self._cameras.items()
+        )
         self._connected = True
     
+    def _connect_one(self, sensor_id: int) -> CSICamera | ProcessCSICamera:
+        camera_cls = ProcessCSICamera if self._backend == "process" else CSICamera
+        cam = camera_cls(
+            sensor_id=sensor_id,
+            width=self._width,
+            height=self._height,
+            fps=self._fps,
+        )
+        cam.connect()
+        return cam
+    
+    def _measure_read_offsets(self) -> Dict[int, float]:
+        """Delay per camera that lines its reads up with the slowest camera."""
+        if self._sync_warmup_frames <= 0:
+            return {}
+        
+        delays = {}
+        for sid, cam in self._cameras.items():
+            samples = []
+            for _ in range(self._sync_warmup_frames):
+                start = time.monotonic()
+                if cam.read() is not None:
+                    samples.append(time.monotonic() - start)
+            delays[sid] = sum(samples) / len(samples) if samples else 0.0
+        
+        max_delay = max(delays.values(), default=0.0)
+        return {
+            sid: (max_delay - d) / 2
+            for sid, d in delays.items()
+            if max_delay - d > 0
+        }
+    
+    def _delayed_read(self, cam, offset: float) -> Optional[SensorFrame]:
+        time.sleep(offset)
+        return cam.read()
+    
     def disconnect(self) -> None:
         """Disconnect all cameras."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
         for cam in self._cameras.values():
             cam.disconnect()
         self._cameras.clear()
+        self._ids = ()
+        self._readers = ()
         self._connected = False
     
     def read(self) -> MultiFrame:
@@ -97,17 +185,28 @@ class MultiCamera:
         if not self._connected:
             raise RuntimeError("MultiCamera is not connected")
         
-        frames = {}
-        for sid, cam in self._cameras.items():
-            frame = cam.read()
-            if frame:
-                frames[sid] = frame
+        # Camera reads block outside the GIL, so they overlap across workers
+        submit = self._pool.submit
+        futures = [submit(reader) for reader in self._readers]
+        frames = tuple(future.result() or None for future in futures)
         
-        # Use timestamp from first frame
-        ts = list(frames.values())[0].timestamp if frames else 0.0
-        wt = list(frames.values())[0].wall_time if frames else datetime.now()
+        present = [f for f in frames if f is not None]
+        if not present:
+            return MultiFrame(
+                timestamp=0.0, wall_time=datetime.now(), ids=self._ids, frames=frames
+            )
         
-        return MultiFrame(timestamp=ts, wall_time=wt, frames=frames)
+        # Stamp the set with its earliest frame. Each camera's timestamp counts
+        # from its own first frame, so frames are compared on the wall clock.
+        first = min(present, key=lambda f: f.wall_time)
+        last_wall = max(f.wall_time for f in present)
+        return MultiFrame(
+            timestamp=first.timestamp,
+            wall_time=first.wall_time,
+            ids=self._ids,
+            frames=frames,
+            sync_skew_ns=int((last_wall - first.wall_time).total_seconds() * 1e9),
+        )
     
     def stream(
         self,
@@ -129,37 +228,31 @@ class MultiCamera:
         if not self._connected:
             raise RuntimeError("MultiCamera is not connected")
         
-        start_time = time.monotonic()
+        # Integer nanoseconds; sleep once to the next deadline instead of polling
+        start_ns = time.monotonic_ns()
+        duration_ns = int(duration * 1e9) if duration is not None else None
+        interval_ns = int(1e9 / target_fps) if target_fps else None
+        next_due_ns = start_ns
         frame_count = 0
-        frame_interval = 1.0 / target_fps if target_fps else None
-        last_frame_time = 0.0
         
         while True:
-            # Check duration limit
-            if duration is not None:
-                elapsed = time.monotonic() - start_time
-                if elapsed >= duration:
-                    break
-            
-            # Check frame limit
             if max_frames is not None and frame_count >= max_frames:
                 break
             
-            # FPS throttling
-            if frame_interval is not None:
-                current_time = time.monotonic()
-                time_since_last = current_time - last_frame_time
-                if time_since_last < frame_interval:
-                    sleep_time = frame_interval - time_since_last - 0.001
-                    if sleep_time > 0:
-                        time.sleep(sleep_time)
-                    continue
+            now_ns = time.monotonic_ns()
+            if interval_ns is not None and next_due_ns > now_ns:
+                time.sleep((next_due_ns - now_ns) / 1e9)
+                now_ns = next_due_ns
+            
+            if duration_ns is not None and now_ns - start_ns >= duration_ns:
+                break
             
             # Read from all cameras
             multi_frame = self.read()
-            if multi_frame.frames:
+            if len(multi_frame):
                 frame_count += 1
-                last_frame_time = time.monotonic()
+                if interval_ns is not None:
+                    next_due_ns = now_ns + interval_ns
                 yield multi_frame
     
     def __enter__(self) -> "MultiCamera":
@@ -2,7 +2,7 @@
 
 from typing import Optional, Generator, Dict, Any
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 import time
 import numpy as np
 import depthai as dai
@@ -10,6 +10,15 @@ import depthai as dai
 from ..core.sensor import Sensor
 from ..core.frame import SensorFrame, SensorMetadata, SensorType, FrameType
 
+# Max timestamp spread between the RGB and depth frames of one synced group
+SYNC_THRESHOLD = timedelta(milliseconds=15)
+
+# read() gives up and returns None after this many frame intervals
+READ_TIMEOUT_FRAMES = 2
+
+# Columns of OakDFrame.imu_samples; t_s is the accelerometer's device timestamp
+IMU_COLUMNS = ("ax", "ay", "az", "gx", "gy", "gz", "t_s")
+
 
 @dataclass
 class OakDFrame:
@@ -18,7 +27,8 @@ class OakDFrame:
     wall_time: datetime
     rgb: Optional[np.ndarray] = None
     depth: Optional[np.ndarray] = None
-    imu: Optional[Dict[str, Any]] = None
+    imu: Optional[Dict[str, Any]] = None  # latest sample
+    imu_samples: Optional[np.ndarray] = None  # every sample since the last frame, IMU_COLUMNS
 
 
 class OakDProError(Exception):
@@ -44,9 +54,12 @@ class OakDPro(Sensor):
         ir_brightness: int = 800,
     ):
         self._rgb_size = rgb_size
+        # BGR888p is planar: three full-size planes, one per channel
+        self._rgb_planes = (3, rgb_size[1], rgb_size[0])
         self._depth_enabled = depth_enabled
         self._imu_enabled = imu_enabled
         self._fps = fps
+        self._read_timeout = timedelta(seconds=READ_TIMEOUT_FRAMES / fps)
         self._depth_preset = depth_preset
         self._depth_size = depth_size
         self._median_filter = median_filter
@@ -56,7 +69,7 @@ class OakDPro(Sensor):
         
         self._pipeline: Optional[dai.Pipeline] = None
         self._rgb_queue = None
-        self._depth_queue = None
+        self._sync_queue = None
         self._imu_queue = None
         
         super().__init__(
@@ -91,11 +104,12 @@ class OakDPro(Sensor):
         
         try:
             self._pipeline = dai.Pipeline()
+            # Send each message in one XLink write instead of 64 KiB chunks
+            self._pipeline.setXLinkChunkSize(0)
             
             # RGB Camera
             cam = self._pipeline.create(dai.node.Camera).build(dai.CameraBoardSocket.CAM_A)
             rgb_out = cam.requestOutput(self._rgb_size, dai.ImgFrame.Type.BGR888p, fps=self._fps)
-            self._rgb_queue = rgb_out.createOutputQueue()
             
             # Stereo Depth
             if self._depth_enabled:
@@ -109,7 +123,14 @@ class OakDPro(Sensor):
                 stereo.initialConfig.setMedianFilter(self._get_median_filter())
                 stereo.initialConfig.setConfidenceThreshold(self._confidence_threshold)
                 
-                self._depth_queue = stereo.depth.createOutputQueue()
+                # Pair RGB and depth on the device so read() takes one group
+                sync = self._pipeline.create(dai.node.Sync)
+                sync.setSyncThreshold(SYNC_THRESHOLD)
+                rgb_out.link(sync.inputs["rgb"])
+                stereo.depth.link(sync.inputs["depth"])
+                self._sync_queue = sync.out.createOutputQueue(maxSize=1, blocking=False)
+            else:
+                self._rgb_queue = rgb_out.createOutputQueue(maxSize=1, blocking=False)
             
             # IMU
             if self._imu_enabled:
@@ -149,6 +170,10 @@ class OakDPro(Sensor):
                 },
             )
             
+            # The enabled streams are fixed now; pick the read path once
+            self._read_images = self._read_synced if self._depth_enabled else self._read_rgb_only
+            self._read_imu_step = self._read_imu if self._imu_enabled else self._skip_imu
+            
             self._connected = True
             self._time_offset = None
             
@@ -160,47 +185,89 @@ class OakDPro(Sensor):
             self._pipeline.stop()
             self._pipeline = None
         self._rgb_queue = None
-        self._depth_queue = None
+        self._sync_queue = None
         self._imu_queue = None
         self._connected = False
     
-    def read(self) -> Optional[OakDFrame]:
-        """Read a frame from OAK-D Pro."""
-        if not self._connected:
-            raise RuntimeError("OAK-D Pro is not connected")
-        
-        timestamp, wall_time = self._get_timestamp()
+    def _planar_to_bgr(self, msg) -> np.ndarray:
+        # An HxWx3 strided view over the message's planes; getCvFrame() would
+        # interleave them into a new array. OpenCV copies it if it needs to.
+        planes = np.frombuffer(msg.getData(), dtype=np.uint8).reshape(self._rgb_planes)
+        return planes.transpose(1, 2, 0)
+    
+    def _read_synced(self) -> tuple:
+        group, timed_out = self._sync_queue.get(self._read_timeout)
+        if timed_out:
+            return None, None
+        rgb = self._planar_to_bgr(group["rgb"])
+        # Flip to align with RGB camera orientation; a strided view,
+        # no copy (writers make it contiguous if they need to)
+        depth = group["depth"].getFrame()[::-1]
+        return rgb, depth
+    
+    def _read_rgb_only(self) -> tuple:
+        msg, timed_out = self._rgb_queue.get(self._read_timeout)
+        if timed_out:
+            return None, None
+        return self._planar_to_bgr(msg), None
+    
+    def _read_imu(self) -> tuple:
+        # has() is a non-allocating peek, so the common no-new-IMU case skips
+        # building the (empty) message list
+        if not self._imu_queue.has():
+            return None, None
         
-        rgb = None
-        rgb_msg = self._rgb_queue.tryGet()
-        if rgb_msg:
-            rgb = rgb_msg.getCvFrame()
+        # Drain every queued report, not just the newest packet
+        packets = [p for msg in self._imu_queue.tryGetAll() for p in msg.packets]
+        if not packets:
+            return None, None
         
-        depth = None
-        if self._depth_queue:
-            depth_msg = self._depth_queue.tryGet()
-            if depth_msg:
-                # Rotate 180° to align with RGB camera orientation
-                depth = np.flipud(depth_msg.getFrame())
+        imu_samples = np.array(
+            [
+                (
+                    p.acceleroMeter.x, p.acceleroMeter.y, p.acceleroMeter.z,
+                    p.gyroscope.x, p.gyroscope.y, p.gyroscope.z,
+                    p.acceleroMeter.getTimestamp().total_seconds(),
+                )
+                for p in packets
+            ],
+            dtype=np.float64,
+        )
+        ax, ay, az, gx, gy, gz, _ = imu_samples[-1].tolist()
+        imu_data = {
+            "accelerometer": {"x": ax, "y": ay, "z": az},
+            "gyroscope": {"x": gx, "y": gy, "z": gz},
+        }
+        return imu_data, imu_samples
+    
+    @staticmethod
+    def _skip_imu() -> tuple:
+        return None, None
+    
+    def read(self) -> Optional[OakDFrame]:
+        """
+        Read a frame from OAK-D Pro, blocking until the next one arrives.
         
-        imu_data = None
-        if self._imu_queue:
-            imu_msg = self._imu_queue.tryGet()
-            if imu_msg:
-                packets = imu_msg.packets
-                if packets:
-                    latest = packets[-1]
-                    accel = latest.acceleroMeter
-                    gyro = latest.gyroscope
-                    imu_data = {
-                        "accelerometer": {"x": accel.x, "y": accel.y, "z": accel.z},
-                        "gyroscope": {"x": gyro.x, "y": gyro.y, "z": gyro.z},
-                    }
+        Returns None if no frame arrives within READ_TIMEOUT_FRAMES frame
+        intervals.
+        """
+        if not self._connected:
+            raise RuntimeError("OAK-D Pro is not connected")
         
+        rgb, depth = self._read_images()
         if rgb is None:
             return None
+        timestamp, wall_time = self._get_timestamp()
+        imu_data, imu_samples = self._read_imu_step()
         
-        return OakDFrame(timestamp=timestamp, wall_time=wall_time, rgb=rgb, depth=depth, imu=imu_data)
+        return OakDFrame(
+            timestamp=timestamp,
+            wall_time=wall_time,
+            rgb=rgb,
+            depth=depth,
+            imu=imu_data,
+            imu_samples=imu_samples,
+        )
     
     def stream(
         self,
@@ -212,27 +279,30 @@ class OakDPro(Sensor):
         if not self._connected:
             raise RuntimeError("OAK-D Pro is not connected")
         
-        start_time = time.monotonic()
+        # Integer nanoseconds; sleep once to the next deadline instead of polling
+        start_ns = time.monotonic_ns()
+        duration_ns = int(duration * 1e9) if duration else None
+        interval_ns = int(1e9 / target_fps) if target_fps else None
+        next_due_ns = start_ns
         frame_count = 0
-        frame_interval = 1.0 / target_fps if target_fps else 0.0
-        last_frame_time = 0.0
         
         while True:
-            if duration and (time.monotonic() - start_time) >= duration:
-                break
             if max_frames and frame_count >= max_frames:
                 break
             
-            if frame_interval:
-                current = time.monotonic()
-                if current - last_frame_time < frame_interval:
-                    time.sleep(0.001)
-                    continue
+            now_ns = time.monotonic_ns()
+            if interval_ns is not None and next_due_ns > now_ns:
+                time.sleep((next_due_ns - now_ns) / 1e9)
+                now_ns = next_due_ns
+            
+            if duration_ns is not None and now_ns - start_ns >= duration_ns:
+                break
             
             frame = self.read()
             if frame and frame.rgb is not None:
                 frame_count += 1
-                last_frame_time = time.monotonic()
+                if interval_ns is not None:
+                    next_due_ns = now_ns + interval_ns
                 yield frame
 
 
@@ -0,0 +1,242 @@
+"""CSI camera captured in a worker process, frames shared through shared memory."""
+
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import Optional
+import multiprocessing as mp
+import logging
+
+import numpy as np
+
+from .csi_camera import (
+    CSICamera,
+    CameraConnectionError,
+    CameraReadError,
+    READ_TIMEOUT,
+    _BGR_METADATA,
+)
+from ..core.sensor import Sensor
+from ..core.frame import SensorFrame, SensorMetadata, SensorType, FrameType
+
+logger = logging.getLogger(__name__)
+
+# Ring slots: one held by the reader, one latest, one being written
+RING_DEPTH = 3
+
+# Per-slot header: timestamp, wall time (epoch seconds)
+_HEADER_FIELDS = 2
+
+# Time allowed for the worker to open the camera (covers connect retries)
+CONNECT_TIMEOUT = 30.0
+
+
+def _ring_views(buf, width: int, height: int) -> tuple[np.ndarray, np.ndarray]:
+    headers = np.ndarray((RING_DEPTH, _HEADER_FIELDS), dtype=np.float64, buffer=buf)
+    frames = np.ndarray(
+        (RING_DEPTH, height, width, 3),
+        dtype=np.uint8,
+        buffer=buf,
+        offset=headers.nbytes,
+    )
+    return headers, frames
+
+
+def _ring_size(width: int, height: int) -> int:
+    return RING_DEPTH * (_HEADER_FIELDS * 8 + height * width * 3)
+
+
+def _capture_worker(
+    shm_name: str,
+    camera_kwargs: dict,
+    lock,
+    latest,
+    held,
+    frame_ready,
+    stop,
+    failed,
+    conn,
+) -> None:
+    """Worker process: read CSI frames and publish them into the shared ring."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    headers, frames = _ring_views(shm.buf, camera_kwargs["width"], camera_kwargs["height"])
+    cam = CSICamera(**camera_kwargs)
+    try:
+        try:
+            cam.connect()
+        except CameraConnectionError as e:
+            conn.send(str(e))
+            return
+        conn.send(None)
+        
+        writing = 0
+        while not stop.is_set():
+            try:
+                frame = cam.read()
+            except CameraReadError as e:
+                logger.error(f"{cam.sensor_id} worker stopped: {e}")
+                failed.value = 1
+                frame_ready.set()
+                return
+            if frame is None:
+                continue
+            
+            np.copyto(frames[writing], frame.data)
+            headers[writing] = (frame.timestamp, frame.wall_time.timestamp())
+            
+            # Publish, then pick a slot that is neither latest nor held
+            with lock:
+                latest.value = writing
+                frame_ready.set()
+                writing = next(
+                    s for s in range(RING_DEPTH) if s != writing and s != held.value
+                )
+    finally:
+        cam.disconnect()
+        del headers, frames
+        shm.close()
+
+
+class ProcessCSICamera(Sensor):
+    """
+    CSI camera whose capture runs in a separate process.
+    
+    The worker owns a CSICamera and copies each frame into a shared-memory
+    ring; read() returns a zero-copy view of the newest slot. Running one
+    process per camera keeps the cameras' Python-side work off a shared
+    GIL. The returned data is valid until the next read(); copy it to keep
+    it.
+    """
+    
+    def __init__(
+        self,
+        sensor_id: int = 0,
+        width: int = 1280,
+        height: int = 720,
+        fps: int = 30,
+        **camera_kwargs,
+    ):
+        self._camera_kwargs = dict(
+            camera_kwargs, sensor_id=sensor_id, width=width, height=height, fps=fps
+        )
+        self._csi_sensor_id = sensor_id
+        self._width = width
+        self._height = height
+        self._fps = fps
+        
+        super().__init__(
+            sensor_id=f"csi_camera_{sensor_id}",
+            sensor_type=SensorType.CAMERA
+        )
+        self._ctx = mp.get_context("spawn")
+        self._process = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._headers: Optional[np.ndarray] = None
+        self._frames: Optional[np.ndarray] = None
+    
+    def connect(self) -> None:
+        if self._connected:
+            return
+        
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=_ring_size(self._width, self._height)
+        )
+        self._headers, self._frames = _ring_views(self._shm.buf, self._width, self._height)
+        
+        ctx = self._ctx
+        self._lock = ctx.Lock()
+        self._latest = ctx.Value("i", -1, lock=False)
+        self._held = ctx.Value("i", -1, lock=False)
+        self._frame_ready = ctx.Event()
+        self._stop = ctx.Event()
+        self._failed = ctx.Value("b", 0, lock=False)
+        parent_conn, child_conn = ctx.Pipe(duplex=False)
+        
+        self._process = ctx.Process(
+            target=_capture_worker,
+            args=(
+                self._shm.name, self._camera_kwargs, self._lock, self._latest,
+                self._held, self._frame_ready, self._stop, self._failed, child_conn,
+            ),
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        
+        error = "worker did not start"
+        if parent_conn.poll(CONNECT_TIMEOUT):
+            try:
+                error = parent_conn.recv()
+            except EOFError:
+                pass
+        parent_conn.close()
+        if error is not None:
+            self.disconnect()
+            raise CameraConnectionError(
+                f"Failed to open CSI camera {self._csi_sensor_id} in worker: {error}"
+            )
+        
+        self._metadata = SensorMetadata(
+            sensor_id=self._sensor_id,
+            sensor_type=SensorType.CAMERA,
+            manufacturer="Arducam",
+            model="CSI Camera",
+            config={
+                "width": self._width,
+                "height": self._height,
+                "fps": self._fps,
+                "csi_sensor_id": self._csi_sensor_id,
+                "backend": "process",
+            },
+        )
+        self._connected = True
+        self._sequence_number = 0
+    
+    def disconnect(self) -> None:
+        if self._process is not None:
+            self._stop.set()
+            self._process.join(timeout=5.0)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+            self._process = None
+        
+        if self._shm is not None:
+            self._headers = self._frames = None
+            try:
+                self._shm.close()
+            except BufferError:
+                logger.warning(f"{self._sensor_id}: frames still referenced at disconnect")
+            self._shm.unlink()
+            self._shm = None
+        self._connected = False
+    
+    def read(self) -> Optional[SensorFrame]:
+        if not self._connected:
+            raise RuntimeError(f"Camera {self._sensor_id} is not connected")
+        
+        if not self._frame_ready.wait(READ_TIMEOUT):
+            if self._failed.value or not self._process.is_alive():
+                raise CameraReadError(f"Camera {self._csi_sensor_id} worker stopped")
+            return None
+        if self._failed.value:
+            raise CameraReadError(f"Camera {self._csi_sensor_id} failed")
+        
+        # Holding the slot stops the worker from writing into it. The event is
+        # cleared under the same lock the worker publishes with, so it is only
+        # set again by a newer frame.
+        with self._lock:
+            self._frame_ready.clear()
+            slot = self._latest.value
+            self._held.value = slot
+        
+        timestamp, wall_epoch = self._headers[slot]
+        return SensorFrame(
+            sensor_id=self._sensor_id,
+            sensor_type=SensorType.CAMERA,
+            frame_type=FrameType.IMAGE,
+            timestamp=float(timestamp),
+            wall_time=datetime.fromtimestamp(wall_epoch),
+            sequence_number=self._next_sequence(),
+            data=self._frames[slot],
+            metadata=_BGR_METADATA,
+        )
@@ -1,6 +1,9 @@
 """RPLIDAR Driver with error handling."""
 
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from typing import Optional, Generator
+import threading
 import time
 import logging
 import numpy as np
@@ -8,9 +11,34 @@ from rplidar import RPLidar as RPLidarDevice, RPLidarException
 
 from ..core.sensor import Sensor
 from ..core.frame import SensorFrame, SensorMetadata, SensorType, FrameType
+from ._lidar_kernels import PACKET_SIZE, parse_packets, scan_to_xyzq
 
 logger = logging.getLogger(__name__)
 
+# Initial scan staging rows; a full A1/A2 revolution is a few hundred points
+SCAN_BUFFER_ROWS = 1024
+
+# How long read() waits for the scan thread before returning None
+SCAN_TIMEOUT = 1.0
+
+# Unread serial bytes beyond which the scan is restarted (matches rplidar's default)
+MAX_BUFFERED_BYTES = 3000
+
+# Rotations with this many valid points or fewer are discarded, as rplidar does
+MIN_SCAN_POINTS = 5
+
+# Device tuples are (quality, angle, distance); frames use (angle, distance, quality)
+_POLAR_ORDER = np.array([1, 2, 0])
+# Immutable, so every frame's metadata can share them
+_POLAR_COLUMNS = ("angle_deg", "distance_mm", "quality")
+_XYZ_COLUMNS = ("x_mm", "y_mm", "z_mm", "quality")
+
+# Packed scan rows: 5 bytes per point instead of 12 as float32
+LIDAR_DTYPE = np.dtype(
+    [("angle_cdeg", np.uint16), ("distance_mm", np.uint16), ("quality", np.uint8)],
+    align=False,
+)
+
 
 class LidarError(Exception):
     """Base exception for LIDAR errors."""
@@ -46,6 +74,10 @@ class RPLidarSensor(Sensor):
         max_reconnect_attempts: int = 3,
         reconnect_delay: float = 2.0,
         max_consecutive_failures: int = 5,
+        as_xyz: bool = False,
+        reuse_buffers: bool = False,
+        native_parse: bool = True,
+        packed: bool = False,
     ):
         """
         Initialize RPLIDAR sensor.
@@ -57,7 +89,22 @@ class RPLidarSensor(Sensor):
             max_reconnect_attempts: Max reconnection attempts
             reconnect_delay: Delay between attempts (seconds)
             max_consecutive_failures: Max failures before error
+            as_xyz: Return (x_mm, y_mm, z_mm, quality) points instead of
+                polar (angle_deg, distance_mm, quality) rows; zero-distance
+                returns are dropped
+            reuse_buffers: Write scans into two alternating pre-allocated
+                buffers instead of a new array per read. Frame data is then
+                only valid until the second read() after it; copy it to
+                keep it.
+            native_parse: Read the serial port directly and decode packets
+                in bulk (Numba when available) instead of through the
+                rplidar package's per-packet Python parser
+            packed: Return LIDAR_DTYPE structured rows (angle in 1/100 deg,
+                distance in whole mm); see unpack_scan()
         """
+        if as_xyz and packed:
+            raise ValueError("as_xyz and packed are mutually exclusive")
+        
         self._port = port
         
         if sensor_id is None:
@@ -68,6 +115,10 @@ class RPLidarSensor(Sensor):
         self._max_reconnect_attempts = max_reconnect_attempts
         self._reconnect_delay = reconnect_delay
         self._max_consecutive_failures = max_consecutive_failures
+        self._as_xyz = as_xyz
+        self._reuse_buffers = reuse_buffers
+        self._native_parse = native_parse
+        self._packed = packed
         
         # Stats
         self._consecutive_failures = 0
@@ -78,6 +129,16 @@ class RPLidarSensor(Sensor):
         
         self._lidar: Optional[RPLidarDevice] = None
         self._scan_iterator = None
+        self._scan_buffer: Optional[np.ndarray] = None
+        self._out_buffers: list[Optional[np.ndarray]] = [None, None]
+        self._out_sel = 0
+        
+        # Scan thread: newest (scan, timestamp, wall_time) or the error that ended it
+        self._scan_thread: Optional[threading.Thread] = None
+        self._scan_stop: Optional[threading.Event] = None
+        self._scan_cond = threading.Condition()
+        self._latest_scan: Optional[tuple] = None
+        self._scan_error: Optional[Exception] = None
     
     @property
     def port(self) -> str:
@@ -142,9 +203,15 @@ class RPLidarSensor(Sensor):
         self._time_offset = None
         self._consecutive_failures = 0
         self._scan_iterator = None
+        if self._scan_buffer is None:
+            self._scan_buffer = np.empty((SCAN_BUFFER_ROWS, 3), dtype=np.float32)
     
     def disconnect(self) -> None:
         """Disconnect from the RPLIDAR."""
+        thread, stop = self._scan_thread, self._scan_stop
+        self._scan_thread = None
+        if stop is not None:
+            stop.set()
         if self._lidar is not None:
             try:
                 self._lidar.stop()
@@ -153,7 +220,12 @@ class RPLidarSensor(Sensor):
             except Exception as e:
                 logger.warning(f"Error during RPLIDAR disconnect: {e}")
             self._lidar = None
+        # Closing the port unblocks the scan thread's serial read
+        if thread is not None:
+            thread.join(timeout=SCAN_TIMEOUT)
         self._scan_iterator = None
+        self._latest_scan = None
+        self._scan_error = None
         self._connected = False
         logger.info(f"RPLIDAR disconnected. Stats: {self.stats}")
     
@@ -173,56 +245,210 @@ class RPLidarSensor(Sensor):
         if not self._connected or self._lidar is None:
             raise RuntimeError(f"RPLIDAR {self._sensor_id} is not connected")
         
-        try:
-            if self._scan_iterator is None:
-                self._scan_iterator = self._lidar.iter_scans()
+        # Iterate rather than recurse, so a flapping device cannot grow the stack
+        while True:
+            if self._scan_thread is None:
+                self._start_scan_thread()
             
-            scan = next(self._scan_iterator)
+            latest, error = self._take_scan()
+            if error is None:
+                if latest is None:
+                    return None
+                break
             
-            # Success
-            self._consecutive_failures = 0
-            self._total_scans += 1
+            # The scan thread has exited; the next read() starts another
+            self._scan_thread = None
+            self._consecutive_failures += 1
+            self._failed_scans += 1
             
-            scan_array = np.array(
-                [(angle, distance, quality) for quality, angle, distance in scan],
-                dtype=np.float32
+            logger.warning(
+                f"RPLIDAR scan failed ({self._consecutive_failures} consecutive): {error}"
             )
             
-            timestamp, wall_time = self._get_timestamp()
-            
-            return SensorFrame(
-                sensor_id=self._sensor_id,
-                sensor_type=SensorType.LIDAR,
-                frame_type=FrameType.SCAN,
-                timestamp=timestamp,
-                wall_time=wall_time,
-                sequence_number=self._next_sequence(),
-                data=scan_array,
-                metadata={
-                    "num_points": len(scan_array),
-                    "columns": ["angle_deg", "distance_mm", "quality"],
-                },
+            if self._consecutive_failures < self._max_consecutive_failures:
+                return None
+            if not self._auto_reconnect:
+                raise LidarReadError(
+                    f"RPLIDAR exceeded max consecutive failures ({self._max_consecutive_failures})"
+                )
+            if not self.reconnect():
+                raise LidarReadError(f"RPLIDAR failed after reconnection attempt")
+            self._consecutive_failures = 0
+        
+        # Success
+        self._consecutive_failures = 0
+        self._total_scans += 1
+        
+        scan, timestamp, wall_time = latest
+        raw = self._stage_scan(scan)
+        
+        if self._as_xyz:
+            points = self._output_buffer(len(raw), 4)
+            count = scan_to_xyzq(raw, points)
+            data = points[:count]
+            frame_type = FrameType.POINT_CLOUD
+            columns = _XYZ_COLUMNS
+        elif self._packed:
+            data = pack_scan(raw)
+            frame_type = FrameType.SCAN
+            columns = LIDAR_DTYPE.names
+        else:
+            # Permute into (angle, distance, quality) order in a single copy
+            data = self._output_buffer(len(raw), 3)
+            np.take(raw, _POLAR_ORDER, axis=1, out=data)
+            frame_type = FrameType.SCAN
+            columns = _POLAR_COLUMNS
+        
+        return SensorFrame(
+            sensor_id=self._sensor_id,
+            sensor_type=SensorType.LIDAR,
+            frame_type=frame_type,
+            timestamp=timestamp,
+            wall_time=wall_time,
+            sequence_number=self._next_sequence(),
+            data=data,
+            metadata={
+                "num_points": len(data),
+                "columns": columns,
+            },
+        )
+    
+    def _start_scan_thread(self) -> None:
+        if self._scan_iterator is None:
+            if self._native_parse:
+                self._scan_iterator = self._iter_native_scans()
+            else:
+                self._scan_iterator = self._lidar.iter_scans()
+        
+        self._scan_stop = threading.Event()
+        self._scan_thread = threading.Thread(
+            target=self._scan_loop,
+            args=(self._scan_iterator, self._scan_stop),
+            name=f"{self._sensor_id}-scan",
+            daemon=True,
+        )
+        self._scan_thread.start()
+    
+    def _scan_loop(self, scans, stop: threading.Event) -> None:
+        """Background thread: keep the newest scan ready for read()."""
+        cond = self._scan_cond
+        try:
+            for scan in scans:
+                # Stamp on arrival, not when the caller gets round to reading
+                timestamp, wall_time = self._get_timestamp()
+                with cond:
+                    self._latest_scan = (scan, timestamp, wall_time)
+                    cond.notify()
+                if stop.is_set():
+                    return
+            error = StopIteration("scan iterator exhausted")
+        except Exception as e:
+            error = e
+        
+        if stop.is_set():
+            return
+        with cond:
+            self._scan_error = error
+            cond.notify()
+    
+    def _take_scan(self) -> tuple[Optional[tuple], Optional[Exception]]:
+        """Wait for the next scan; returns (scan, None), (None, error) or (None, None)."""
+        with self._scan_cond:
+            self._scan_cond.wait_for(
+                lambda: self._latest_scan is not None or self._scan_error is not None,
+                timeout=SCAN_TIMEOUT,
             )
+            latest, self._latest_scan = self._latest_scan, None
+            if latest is not None:
+                return latest, None
+            error, self._scan_error = self._scan_error, None
+            return None, error
+    
+    def _iter_native_scans(self) -> Generator[np.ndarray, None, None]:
+        """Yield full rotations as (quality, angle, distance) float32 arrays.
+        
+        Equivalent to RPLidarDevice.iter_scans() in standard scan mode, but
+        packets are pulled off the serial port in bulk and decoded by
+        parse_packets() rather than one struct at a time in Python.
+        """
+        lidar = self._lidar
+        lidar.start_motor()
+        if not lidar.scanning[0]:
+            lidar.start('normal')
+        serial = lidar._serial
+        
+        pending = b''
+        rotation: list[np.ndarray] = []
+        out = np.empty((SCAN_BUFFER_ROWS, 3), dtype=np.float32)
+        new_scan = np.empty(SCAN_BUFFER_ROWS, dtype=bool)
+        
+        while True:
+            waiting = serial.in_waiting
+            if waiting > MAX_BUFFERED_BYTES:
+                logger.warning(
+                    f"RPLIDAR input buffer at {waiting}/{MAX_BUFFERED_BYTES} bytes, restarting scan"
+                )
+                lidar.stop()
+                lidar.start('normal')
+                pending = b''
+                rotation = []
+                continue
             
-        except (StopIteration, RPLidarException) as e:
-            self._consecutive_failures += 1
-            self._failed_scans += 1
-            
-            logger.warning(f"RPLIDAR scan failed ({self._consecutive_failures} consecutive): {e}")
+            # Block for at least one packet, then take whatever else arrived
+            pending += serial.read(max(PACKET_SIZE, waiting))
+            n = len(pending) // PACKET_SIZE
+            if n == 0:
+                continue
+            if n > len(out):
+                out = np.empty((n, 3), dtype=np.float32)
+                new_scan = np.empty(n, dtype=bool)
             
-            if self._consecutive_failures >= self._max_consecutive_failures:
-                if self._auto_reconnect:
-                    if self.reconnect():
-                        self._consecutive_failures = 0
-                        return self.read()
-                    else:
-                        raise LidarReadError(f"RPLIDAR failed after reconnection attempt")
-                else:
-                    raise LidarReadError(
-                        f"RPLIDAR exceeded max consecutive failures ({self._max_consecutive_failures})"
-                    )
+            packets = np.frombuffer(pending, dtype=np.uint8, count=n * PACKET_SIZE)
+            if parse_packets(packets.reshape(n, PACKET_SIZE), out, new_scan) < n:
+                raise RPLidarException('Measurement packet out of sync')
+            pending = pending[n * PACKET_SIZE:]
             
-            return None
+            # A set start flag opens a new rotation with that packet
+            begin = 0
+            for start in np.flatnonzero(new_scan[:n]):
+                segment = out[begin:start]
+                rotation.append(segment[segment[:, 2] > 0])
+                if sum(len(r) for r in rotation) > MIN_SCAN_POINTS:
+                    yield np.concatenate(rotation)
+                rotation = []
+                begin = start
+            segment = out[begin:n]
+            rotation.append(segment[segment[:, 2] > 0])
+    
+    def _stage_scan(self, scan) -> np.ndarray:
+        """Copy the device's (quality, angle, distance) tuples into the staging buffer."""
+        if isinstance(scan, np.ndarray):
+            # Already decoded by _iter_native_scans()
+            return scan
+        
+        n = len(scan)
+        buf = self._scan_buffer
+        if buf is None or n > len(buf):
+            rows = max(n, SCAN_BUFFER_ROWS if buf is None else 2 * len(buf))
+            self._scan_buffer = buf = np.empty((rows, 3), dtype=np.float32)
+        raw = buf[:n]
+        if n:
+            # A flat list converts in one pass; assigning the tuples directly
+            # makes NumPy inspect each one as a row (about 2x slower)
+            raw.reshape(-1)[:] = list(chain.from_iterable(scan))
+        return raw
+    
+    def _output_buffer(self, n: int, cols: int) -> np.ndarray:
+        if not self._reuse_buffers:
+            return np.empty((n, cols), dtype=np.float32)
+        
+        # Alternate between two buffers so the previous frame stays intact
+        self._out_sel ^= 1
+        buf = self._out_buffers[self._out_sel]
+        if buf is None or n > len(buf):
+            buf = np.empty((max(n, SCAN_BUFFER_ROWS), cols), dtype=np.float32)
+            self._out_buffers[self._out_sel] = buf
+        return buf[:n]
     
     def get_info(self) -> dict:
         """Get device info."""
@@ -237,26 +463,51 @@ class RPLidarSensor(Sensor):
         return self._lidar.get_health()
 
 
+def pack_scan(raw: np.ndarray) -> np.ndarray:
+    """Pack (quality, angle_deg, distance_mm) float rows into LIDAR_DTYPE."""
+    packed = np.empty(len(raw), dtype=LIDAR_DTYPE)
+    packed["angle_cdeg"] = np.rint(raw[:, 1] * 100)
+    # Standard-mode distances are at most 16383.75 mm, so they fit in uint16
+    packed["distance_mm"] = np.rint(raw[:, 2])
+    packed["quality"] = raw[:, 0]
+    return packed
+
+
+def unpack_scan(packed: np.ndarray) -> np.ndarray:
+    """Expand LIDAR_DTYPE rows to float32 (angle_deg, distance_mm, quality)."""
+    out = np.empty((len(packed), 3), dtype=np.float32)
+    np.multiply(packed["angle_cdeg"], 0.01, out=out[:, 0], casting="unsafe")
+    out[:, 1] = packed["distance_mm"]
+    out[:, 2] = packed["quality"]
+    return out
+
+
+def _probe_port(port: str) -> Optional[dict]:
+    """Return RPLIDAR info for the device on port, or None if there is none."""
+    try:
+        lidar = RPLidarDevice(port)
+        info = lidar.get_info()
+        lidar.stop()
+        lidar.disconnect()
+    except Exception:
+        return None
+    return {
+        "port": port,
+        "model": info['model'],
+        "serial": info['serialnumber'],
+        "firmware": f"{info['firmware'][0]}.{info['firmware'][1]}",
+    }
+
+
 def discover_rplidars() -> list:
     """Discover connected RPLIDAR devices."""
     import glob
     
     ports = glob.glob('/dev/ttyUSB*') + glob.glob('/dev/ttyACM*')
-    rplidars = []
-    
-    for port in ports:
-        try:
-            lidar = RPLidarDevice(port)
-            info = lidar.get_info()
-            rplidars.append({
-                "port": port,
-                "model": info['model'],
-                "serial": info['serialnumber'],
-                "firmware": f"{info['firmware'][0]}.{info['firmware'][1]}",
-            })
-            lidar.stop()
-            lidar.disconnect()
-        except Exception:
-            pass
+    if not ports:
+        return []
     
-    return rplidars
+    # Each probe waits on a serial handshake, so probe every port at once
+    with ThreadPoolExecutor(max_workers=len(ports)) as pool:
+        results = pool.map(_probe_port, ports)
+    return [info for info in results if info is not None]
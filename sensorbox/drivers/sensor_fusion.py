@@ -2,17 +2,24 @@
 Multi-sensor streaming for synchronized camera and LIDAR capture.
 """
 
-from typing import Optional, List, Dict, Generator
+from typing import Optional, List, Dict, Generator, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 import threading
-import queue
 import time
+import logging
 
 from .csi_camera import CSICamera
 from .rplidar import RPLidarSensor
 from ..core.frame import SensorFrame
 
+logger = logging.getLogger(__name__)
+
+# Worker errors kept for get_errors(); older ones are dropped
+MAX_RECENT_ERRORS = 32
+
 
 @dataclass
 class FusedFrame:
@@ -83,12 +90,16 @@ class SensorFusion:
         
         self._cameras: Dict[int, CSICamera] = {}
         self._lidar: Optional[RPLidarSensor] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
         self._connected = False
         
         # Threading for async LIDAR capture
         self._lidar_thread: Optional[threading.Thread] = None
-        self._lidar_queue: queue.Queue = queue.Queue(maxsize=10)
+        # Latest-only slot: append() drops the previous scan atomically
+        self._lidar_deque: deque = deque(maxlen=1)
         self._stop_event = threading.Event()
+        # (wall time, message) of recent worker errors; appends are atomic
+        self._errors: deque = deque(maxlen=MAX_RECENT_ERRORS)
     
     @property
     def is_connected(self) -> bool:
@@ -118,6 +129,12 @@ class SensorFusion:
             cam.connect()
             self._cameras[cam_id] = cam
         
+        # One worker per camera, so each read() waits on every camera at once
+        if self._cameras:
+            self._pool = ThreadPoolExecutor(
+                max_workers=len(self._cameras), thread_name_prefix="fusion-cam"
+            )
+        
         # Connect LIDAR
         if self._lidar_port:
             self._lidar = RPLidarSensor(self._lidar_port)
@@ -139,6 +156,9 @@ class SensorFusion:
             self._lidar_thread = None
         
         # Disconnect cameras
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
         for cam in self._cameras.values():
             cam.disconnect()
         self._cameras.clear()
@@ -148,12 +168,7 @@ class SensorFusion:
             self._lidar.disconnect()
             self._lidar = None
         
-        # Clear queue
-        while not self._lidar_queue.empty():
-            try:
-                self._lidar_queue.get_nowait()
-            except queue.Empty:
-                break
+        self._lidar_deque.clear()
         
         self._connected = False
     
@@ -167,27 +182,22 @@ class SensorFusion:
                 if self._stop_event.is_set():
                     break
                 
-                # Put frame in queue, drop old if full
-                try:
-                    self._lidar_queue.put_nowait(frame)
-                except queue.Full:
-                    try:
-                        self._lidar_queue.get_nowait()
-                        self._lidar_queue.put_nowait(frame)
-                    except queue.Empty:
-                        pass
+                self._lidar_deque.append(frame)
         except Exception as e:
-            print(f"LIDAR worker error: {e}")
+            # The worker ends here, so this is logged once, not per scan
+            self._errors.append((time.time(), f"LIDAR worker error: {e}"))
+            logger.error(f"LIDAR worker stopped: {e}")
+    
+    def get_errors(self) -> List[Tuple[float, str]]:
+        """Recent background errors as (epoch seconds, message), oldest first."""
+        return list(self._errors)
     
     def _get_latest_lidar(self) -> Optional[SensorFrame]:
         """Get the most recent LIDAR frame (non-blocking)."""
-        latest = None
-        while True:
-            try:
-                latest = self._lidar_queue.get_nowait()
-            except queue.Empty:
-                break
-        return latest
+        try:
+            return self._lidar_deque.pop()
+        except IndexError:
+            return None
     
     def read(self) -> FusedFrame:
         """Read one frame from all sensors."""
@@ -197,12 +207,17 @@ class SensorFusion:
         timestamp = time.monotonic()
         wall_time = datetime.now()
         
-        # Read from cameras
+        # Read from cameras; reads block outside the GIL, so they overlap
         cameras = {}
-        for cam_id, cam in self._cameras.items():
-            frame = cam.read()
-            if frame:
-                cameras[cam_id] = frame
+        if self._pool is not None:
+            futures = {
+                cam_id: self._pool.submit(cam.read)
+                for cam_id, cam in self._cameras.items()
+            }
+            for cam_id, future in futures.items():
+                frame = future.result()
+                if frame:
+                    cameras[cam_id] = frame
         
         # Get latest LIDAR
         lidar_frame = self._get_latest_lidar()
@@ -234,32 +249,36 @@ class SensorFusion:
         if not self._connected:
             raise RuntimeError("SensorFusion is not connected")
         
-        start_time = time.monotonic()
+        # Integer nanoseconds; sleep once to the next deadline instead of polling
+        start_ns = time.monotonic_ns()
+        duration_ns = int(duration * 1e9) if duration is not None else None
+        interval_ns = int(1e9 / target_fps) if target_fps else None
+        next_due_ns = start_ns
         frame_count = 0
-        frame_interval = 1.0 / target_fps if target_fps else None
-        last_frame_time = 0.0
         
         while True:
-            # Check duration
-            if duration is not None:
-                if time.monotonic() - start_time >= duration:
-                    break
-            
             # Check frame limit
             if max_frames is not None and frame_count >= max_frames:
                 break
             
             # FPS throttling
-            if frame_interval:
-                current = time.monotonic()
-                if current - last_frame_time < frame_interval:
-                    time.sleep(0.001)
-                    continue
+            now_ns = time.monotonic_ns()
+            if interval_ns is not None and next_due_ns > now_ns:
+                time.sleep((next_due_ns - now_ns) / 1e9)
+                now_ns = next_due_ns
+            
+            # Check duration
+            if duration_ns is not None and now_ns - start_ns >= duration_ns:
+                break
             
             # Read all sensors
             fused = self.read()
             frame_count += 1
-            last_frame_time = time.monotonic()
+            if interval_ns is not None:
+                # Keep a fixed cadence without drift, but drop slots already missed
+                next_due_ns += interval_ns
+                if next_due_ns < now_ns:
+                    next_due_ns = now_ns + interval_ns
             
             yield fused
     
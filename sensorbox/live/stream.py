@@ -1,10 +1,10 @@
 """Live sensor streaming server."""
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 import threading
-import queue
 import time
 import numpy as np
 
@@ -12,10 +12,21 @@ from ..drivers.oakd import OakDPro
 from ..drivers.csi_camera import CSICamera
 from ..core.pointcloud import depth_to_pointcloud
 
+# Output buffer ring: one held by the reader, one latest, one being written
+RING_DEPTH = 3
+
+# Capture errors kept for get_errors(); older ones are dropped
+MAX_RECENT_ERRORS = 32
+
 
 @dataclass
 class LiveFrame:
-    """A live frame from sensors."""
+    """A live frame from sensors.
+    
+    ``depth_colorized`` and ``pointcloud`` are views into buffers the
+    manager reuses; they stay valid until the reader takes another frame.
+    Copy them to keep them longer.
+    """
     timestamp: float
     wall_time: datetime
     rgb: Optional[np.ndarray] = None
@@ -52,16 +63,28 @@ class LiveStreamManager:
         self._oakd: Optional[OakDPro] = None
         self._csi: Dict[int, CSICamera] = {}
         
-        self._frame_queue: queue.Queue = queue.Queue(maxsize=2)
+        # Latest-frame slot: the capture thread overwrites it, readers take it
+        self._latest: list = [None]
+        self._latest_lock = threading.Lock()
+        self._frame_ready = threading.Event()
+        # Ring slot of the latest frame and of the one the reader last took;
+        # the capture thread never writes into either
+        self._latest_slot = -1
+        self._held_slot = -1
+        self._colorized_bufs: list = [None] * RING_DEPTH
+        self._pc_bufs: list = [None] * RING_DEPTH
         self._capture_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
         self._running = False
+        # (wall time, message) of recent capture errors; appends are atomic
+        self._errors: deque = deque(maxlen=MAX_RECENT_ERRORS)
         
         self._frame_count = 0
-        self._start_time = 0.0
-        self._last_fps_time = 0.0
+        self._start_ns = 0
+        self._last_fps_ns = 0
         self._fps_frame_count = 0
         self._current_fps = 0.0
+        self._depth_lut: Optional[np.ndarray] = None
     
     def _get_depth_settings(self) -> dict:
         """Get depth settings based on quality preset."""
@@ -101,8 +124,8 @@ class LiveStreamManager:
             return
         
         self._stop_event.clear()
-        self._start_time = time.monotonic()
-        self._last_fps_time = self._start_time
+        self._start_ns = time.monotonic_ns()
+        self._last_fps_ns = self._start_ns
         
         if self._oakd_enabled:
             depth_settings = self._get_depth_settings()
@@ -144,51 +167,68 @@ class LiveStreamManager:
         self._running = False
     
     def get_latest(self) -> Optional[LiveFrame]:
-        try:
-            return self._frame_queue.get_nowait()
-        except queue.Empty:
-            return None
+        # The event is cleared under the same lock the capture thread
+        # publishes with, so it is only set again by a newer frame.
+        with self._latest_lock:
+            self._frame_ready.clear()
+            frame, self._latest[0] = self._latest[0], None
+            if frame is not None:
+                self._held_slot = self._latest_slot
+        return frame
+    
+    def get_errors(self) -> List[Tuple[float, str]]:
+        """Recent capture errors as (epoch seconds, message), oldest first."""
+        return list(self._errors)
     
     def get_frame(self, timeout: float = 1.0) -> Optional[LiveFrame]:
-        try:
-            return self._frame_queue.get(timeout=timeout)
-        except queue.Empty:
+        if not self._frame_ready.wait(timeout):
             return None
+        return self.get_latest()
     
     def _capture_loop(self) -> None:
+        writing = 0
         while not self._stop_event.is_set():
             try:
-                frame = self._capture_frame()
-                if frame:
-                    self._frame_count += 1
-                    self._fps_frame_count += 1
-                    
-                    now = time.monotonic()
-                    if now - self._last_fps_time >= 1.0:
-                        self._current_fps = self._fps_frame_count / (now - self._last_fps_time)
-                        self._fps_frame_count = 0
-                        self._last_fps_time = now
-                    
-                    frame.fps = self._current_fps
-                    
-                    try:
-                        self._frame_queue.put_nowait(frame)
-                    except queue.Full:
-                        try:
-                            self._frame_queue.get_nowait()
-                            self._frame_queue.put_nowait(frame)
-                        except:
-                            pass
+                # Sensor reads block until their next frame, which paces the loop
+                frame = self._capture_frame(writing)
+                if frame is None:
+                    # Nothing to read from; back off instead of spinning
+                    self._stop_event.wait(0.01)
+                    continue
+                self._frame_count += 1
+                self._fps_frame_count += 1
                 
-                time.sleep(0.001)
+                now_ns = time.monotonic_ns()
+                elapsed_ns = now_ns - self._last_fps_ns
+                if elapsed_ns >= 1_000_000_000:
+                    self._current_fps = self._fps_frame_count * 1e9 / elapsed_ns
+                    self._fps_frame_count = 0
+                    self._last_fps_ns = now_ns
                 
+                frame.fps = self._current_fps
+                
+                # Publish, then pick a slot that is neither latest nor held
+                with self._latest_lock:
+                    self._latest[0] = frame
+                    self._latest_slot = writing
+                    self._frame_ready.set()
+                    writing = next(
+                        s for s in range(RING_DEPTH)
+                        if s != writing and s != self._held_slot
+                    )
+            
             except Exception as e:
-                print(f"Capture error: {e}")
+                # No print here: it takes the stdout lock and would stall
+                # the capture thread under a burst of errors
+                self._errors.append((time.time(), str(e)))
                 time.sleep(0.1)
     
-    def _capture_frame(self) -> Optional[LiveFrame]:
-        timestamp = time.monotonic() - self._start_time
-        wall_time = datetime.now()
+    def _capture_frame(self, slot: int) -> Optional[LiveFrame]:
+        import cv2
+        
+        timestamp = (time.monotonic_ns() - self._start_ns) / 1e9
+        # Wall clock as an int here; the datetime is only built for an emitted frame
+        wall_ns = time.time_ns()
         
         rgb = None
         depth = None
@@ -206,16 +246,24 @@ class LiveStreamManager:
                 if oakd_frame.depth is not None:
                     # Flip depth horizontally to match RGB camera orientation
                     depth = oakd_frame.depth
-                    depth_colorized = self._colorize_depth(depth)
-                    
                     valid = depth > 0
-                    depth_valid_pct = (valid.sum() / valid.size) * 100
+                    n_valid = cv2.countNonZero(valid.view(np.uint8))
+                    depth_valid_pct = (n_valid / valid.size) * 100
+                    colorized_buf = self._slot_buffer(
+                        self._colorized_bufs, slot, (*depth.shape, 3), np.uint8
+                    )
+                    depth_colorized = self._colorize_depth(depth, valid, n_valid, colorized_buf)
                     
                     if self._enable_pointcloud:
+                        step = self._pc_subsample
+                        max_points = -(-depth.shape[0] // step) * -(-depth.shape[1] // step)
                         pointcloud = depth_to_pointcloud(
                             depth, 
-                            subsample=self._pc_subsample,
+                            subsample=step,
                             max_depth=5000,
+                            out=self._slot_buffer(
+                                self._pc_bufs, slot, (max_points, 3), np.float32
+                            ),
                         )
                 
                 if oakd_frame.imu:
@@ -231,7 +279,7 @@ class LiveStreamManager:
         
         return LiveFrame(
             timestamp=timestamp,
-            wall_time=wall_time,
+            wall_time=datetime.fromtimestamp(wall_ns / 1e9),
             rgb=rgb,
             depth=depth,
             depth_colorized=depth_colorized,
@@ -242,23 +290,50 @@ class LiveStreamManager:
             depth_valid_pct=depth_valid_pct,
         )
     
-    def _colorize_depth(self, depth: np.ndarray) -> np.ndarray:
+    @staticmethod
+    def _slot_buffer(buffers: list, slot: int, shape: tuple, dtype) -> np.ndarray:
+        """Return the ring slot's buffer, (re)allocating it on first use or a shape change."""
+        buf = buffers[slot]
+        if buf is None or buf.shape != shape:
+            buf = buffers[slot] = np.empty(shape, dtype=dtype)
+        return buf
+    
+    def _colorize_depth(
+        self,
+        depth: np.ndarray,
+        valid: np.ndarray,
+        n_valid: int,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
         import cv2
         
-        valid = depth > 0
-        if not np.any(valid):
-            return np.zeros((*depth.shape, 3), dtype=np.uint8)
+        if not n_valid:
+            if out is None:
+                return np.zeros((*depth.shape, 3), dtype=np.uint8)
+            out.fill(0)
+            return out
         
-        depth_norm = np.zeros_like(depth, dtype=np.float32)
-        depth_norm[valid] = depth[valid]
+        # 95th percentile as an order statistic: partition the masked copy in
+        # place rather than sort a float64 copy of it
+        vals = depth[valid]
+        k = int(0.95 * (vals.size - 1))
+        vals.partition(k)
+        max_val = vals[k]
         
-        max_val = np.percentile(depth_norm[valid], 95)
-        depth_norm = np.clip(depth_norm / max_val * 255, 0, 255).astype(np.uint8)
+        # Valid pixels scale into 1..255 and invalid ones become 0, which the
+        # colormap paints black, so no masking pass over the color image
+        scaled = np.multiply(depth, 255.0 / max_val, dtype=np.float32)
+        np.clip(scaled, 1, 255, out=scaled)
+        depth_u8 = scaled.astype(np.uint8)
+        depth_u8 *= valid
         
-        colored = cv2.applyColorMap(depth_norm, cv2.COLORMAP_TURBO)
-        colored[~valid] = 0
-        
-        return colored
+        if self._depth_lut is None:
+            lut = cv2.applyColorMap(
+                np.arange(256, dtype=np.uint8).reshape(256, 1), cv2.COLORMAP_TURBO
+            )
+            lut[0] = 0
+            self._depth_lut = lut
+        return cv2.applyColorMap(depth_u8, self._depth_lut, dst=out)
     
     def __enter__(self):
         self.start()
@@ -4,33 +4,96 @@ import numpy as np
 from dataclasses import dataclass
 from typing import List, Tuple, Optional
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; fall back to NumPy
+    njit = None
 
-@dataclass
+
+@dataclass(slots=True)
 class Plane:
-    """Detected plane in 3D space."""
-    normal: np.ndarray  # Unit normal vector (a, b, c)
-    distance: float  # Distance from origin
-    centroid: np.ndarray  # Center of the plane points
+    """Detected plane in 3D space, as scalars (n . p + distance = 0)."""
+    nx: float  # Unit normal (a, b, c)
+    ny: float
+    nz: float
+    cx: float  # Center of the plane points
+    cy: float
+    cz: float
+    distance: float  # Offset d of the plane equation
     num_points: int
     
+    @property
+    def normal(self) -> np.ndarray:
+        """Unit normal vector (a, b, c)."""
+        return np.array((self.nx, self.ny, self.nz))
+    
+    @property
+    def centroid(self) -> np.ndarray:
+        """Center of the plane points."""
+        return np.array((self.cx, self.cy, self.cz))
+    
     @property
     def is_horizontal(self) -> bool:
         """Check if plane is roughly horizontal (floor/ceiling)."""
-        return abs(self.normal[1]) > 0.9
+        return abs(self.ny) > 0.9
     
     @property
     def is_vertical(self) -> bool:
         """Check if plane is roughly vertical (wall)."""
-        return abs(self.normal[1]) < 0.3
+        return abs(self.ny) < 0.3
     
     @property
     def height(self) -> float:
         """Get height of horizontal plane (Y coordinate)."""
         if self.is_horizontal:
-            return self.centroid[1]
+            return self.cy
         return 0.0
 
 
+# Sampled triangles with a smaller cross product (m^2) are treated as degenerate;
+# float32 cannot resolve much below this at room scale
+_MIN_NORMAL_NORM = np.float32(1e-6)
+
+# Bytes of float32 distances scored per tile in the NumPy RANSAC path
+_RANSAC_TILE_BYTES = 512 * 1024
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _ransac_kernel(points, active, samples, threshold, out):
+        """Score each sampled plane; out rows are (inliers, a, b, c, d)."""
+        for k in prange(samples.shape[0]):
+            p1 = points[samples[k, 0]]
+            p2 = points[samples[k, 1]]
+            p3 = points[samples[k, 2]]
+            ux, uy, uz = p2[0] - p1[0], p2[1] - p1[1], p2[2] - p1[2]
+            vx, vy, vz = p3[0] - p1[0], p3[1] - p1[1], p3[2] - p1[2]
+            a = uy * vz - uz * vy
+            b = uz * vx - ux * vz
+            c = ux * vy - uy * vx
+            norm = np.sqrt(a * a + b * b + c * c)
+            if norm < _MIN_NORMAL_NORM:
+                out[k, 0] = -1.0
+                continue
+            a /= norm
+            b /= norm
+            c /= norm
+            d = -(a * p1[0] + b * p1[1] + c * p1[2])
+            
+            count = 0
+            for i in range(points.shape[0]):
+                if not active[i]:
+                    continue
+                residual = a * points[i, 0] + b * points[i, 1] + c * points[i, 2] + d
+                if abs(residual) < threshold:
+                    count += 1
+            out[k, 0] = count
+            out[k, 1] = a
+            out[k, 2] = b
+            out[k, 3] = c
+            out[k, 4] = d
+
+
 class PlaneDetector:
     """Detect planes from 3D point clouds using RANSAC."""
     
@@ -40,18 +103,23 @@ class PlaneDetector:
         ransac_iterations: int = 100,
         min_plane_points: int = 500,
         max_points_for_ransac: int = 10000,  # Subsample if more
+        seed: Optional[int] = None,  # Fixes the sampling for reproducible results
     ):
         self.distance_threshold = distance_threshold
         self.ransac_iterations = ransac_iterations
         self.min_plane_points = min_plane_points
         self.max_points_for_ransac = max_points_for_ransac
+        self._rng = np.random.default_rng(seed)
     
     def _subsample_points(self, points: np.ndarray) -> np.ndarray:
         """Subsample points if too many."""
         if len(points) <= self.max_points_for_ransac:
             return points
         
-        indices = np.random.choice(len(points), self.max_points_for_ransac, replace=False)
+        # Unique picks without shuffling: no full permutation of the input
+        indices = self._rng.choice(
+            len(points), self.max_points_for_ransac, replace=False, shuffle=False
+        )
         return points[indices]
     
     def detect_planes(
@@ -63,85 +131,119 @@ class PlaneDetector:
         if len(points) < self.min_plane_points:
             return []
         
-        # Subsample for efficiency
-        working_points = self._subsample_points(points)
+        # Subsample for efficiency; float32 halves the memory traffic of the
+        # distance passes, and centimetre thresholds need no more precision
+        working_points = np.ascontiguousarray(self._subsample_points(points), dtype=np.float32)
         
         planes = []
-        remaining_points = working_points.copy()
+        # Points claimed by a plane are masked out instead of copied away
+        active = np.ones(len(working_points), dtype=bool)
         
         for _ in range(max_planes):
-            if len(remaining_points) < self.min_plane_points:
+            candidates = np.flatnonzero(active)
+            if len(candidates) < self.min_plane_points:
                 break
             
-            plane, inlier_mask = self._fit_plane_ransac(remaining_points)
+            plane, inlier_mask = self._fit_plane_ransac(working_points, active, candidates)
             
             if plane is None:
                 break
             
             planes.append(plane)
-            
-            # Remove inlier points
-            remaining_points = remaining_points[~inlier_mask]
+            # Inliers are a subset of the active points, so this clears them
+            # in place without materializing ~inlier_mask
+            active ^= inlier_mask
         
         return planes
     
     def _fit_plane_ransac(
         self,
         points: np.ndarray,
+        active: Optional[np.ndarray] = None,
+        candidates: Optional[np.ndarray] = None,
     ) -> Tuple[Optional[Plane], np.ndarray]:
-        """Fit a plane using RANSAC."""
-        best_plane = None
-        best_inlier_mask = np.zeros(len(points), dtype=bool)
-        best_num_inliers = 0
+        """Fit a plane using RANSAC over the active points.
         
+        ``candidates`` is ``np.flatnonzero(active)``, passed in when the
+        caller already has it. The returned inlier mask covers all points.
+        """
         n_points = len(points)
+        if active is None:
+            active = np.ones(n_points, dtype=bool)
+        if candidates is None:
+            candidates = np.flatnonzero(active)
+        k = self.ransac_iterations
+        threshold = np.float32(self.distance_threshold)
         
-        for _ in range(self.ransac_iterations):
-            # Random sample 3 points
-            idx = np.random.choice(n_points, 3, replace=False)
-            p1, p2, p3 = points[idx]
-            
-            # Compute plane normal
-            v1 = p2 - p1
-            v2 = p3 - p1
-            normal = np.cross(v1, v2)
-            
-            norm = np.linalg.norm(normal)
-            if norm < 1e-10:
-                continue
-            
-            normal = normal / norm
-            
-            # Distance of all points to plane
-            d = -np.dot(normal, p1)
-            distances = np.abs(points @ normal + d)
+        # Sample every hypothesis up front; repeated indices give a zero
+        # normal and are discarded, like a collinear sample
+        samples = candidates[self._rng.integers(0, len(candidates), size=(k, 3))]
+        
+        if njit is not None:
+            scores = np.empty((k, 5), dtype=points.dtype)
+            _ransac_kernel(points, active, samples, threshold, scores)
+            best = scores[:, 0].argmax()
+            num_inliers = int(scores[best, 0])
+            normal = scores[best, 1:4]
+            d = scores[best, 4]
+        else:
+            sample = points[samples]
+            normals = np.cross(sample[:, 1] - sample[:, 0], sample[:, 2] - sample[:, 0])
+            norms = np.linalg.norm(normals, axis=1)
+            valid = norms >= _MIN_NORMAL_NORM
+            if not valid.any():
+                return None, np.zeros(n_points, dtype=bool)
             
-            # Find inliers
-            inlier_mask = distances < self.distance_threshold
-            num_inliers = inlier_mask.sum()
+            normals = normals[valid] / norms[valid, None]
+            ds = -np.einsum('ki,ki->k', normals, sample[valid, 0])
             
-            if num_inliers > best_num_inliers:
-                best_num_inliers = num_inliers
-                best_inlier_mask = inlier_mask
-                
-                inlier_points = points[inlier_mask]
-                centroid = inlier_points.mean(axis=0)
-                
-                # Ensure consistent normal direction
-                if normal[1] < 0:
-                    normal = -normal
-                
-                best_plane = Plane(
-                    normal=normal,
-                    distance=d,
-                    centroid=centroid,
-                    num_points=num_inliers,
-                )
-        
-        if best_plane and best_plane.num_points < self.min_plane_points:
-            return None, np.zeros(len(points), dtype=bool)
-        
-        return best_plane, best_inlier_mask
+            # Score the hypotheses in tiles of rows sized to stay cache
+            # resident, reusing one distance and one mask buffer
+            tile = max(1, _RANSAC_TILE_BYTES // (4 * n_points))
+            dist = np.empty((min(tile, len(normals)), n_points), dtype=np.float32)
+            hits = np.empty(dist.shape, dtype=bool)
+            counts = np.empty(len(normals), dtype=np.intp)
+            for t0 in range(0, len(normals), tile):
+                t1 = min(t0 + tile, len(normals))
+                dt, ht = dist[:t1 - t0], hits[:t1 - t0]
+                np.matmul(normals[t0:t1], points.T, out=dt)
+                dt += ds[t0:t1, None]
+                np.abs(dt, out=dt)
+                np.less(dt, threshold, out=ht)
+                ht &= active
+                counts[t0:t1] = np.count_nonzero(ht, axis=1)
+            best = counts.argmax()
+            num_inliers = int(counts[best])
+            normal = normals[best]
+            d = ds[best]
+        
+        if num_inliers < self.min_plane_points:
+            return None, np.zeros(n_points, dtype=bool)
+        
+        # Winner's inliers with one scratch array and the mask, no temporaries
+        scratch = np.matmul(points, normal.astype(points.dtype, copy=False))
+        scratch += d
+        np.abs(scratch, out=scratch)
+        inlier_mask = np.less(scratch, threshold)
+        inlier_mask &= active
+        # Centroid of the winner only, as a mask-weighted sum: one matvec
+        # instead of gathering the inlier rows into a copy first
+        centroid = (inlier_mask.view(np.uint8) @ points) / np.count_nonzero(inlier_mask)
+        
+        # Ensure consistent normal direction (the offset flips with it)
+        nx, ny, nz = normal.tolist()
+        d = float(d)
+        if ny < 0:
+            nx, ny, nz, d = -nx, -ny, -nz, -d
+        cx, cy, cz = centroid.tolist()
+        
+        best_plane = Plane(
+            nx=nx, ny=ny, nz=nz,
+            cx=cx, cy=cy, cz=cz,
+            distance=d,
+            num_points=num_inliers,
+        )
+        return best_plane, inlier_mask
     
     def find_floor_ceiling(
         self,
@@ -185,7 +287,9 @@ class PlaneDetector:
         sample = self._subsample_points(points)
         y_values = sample[:, 1]
         
-        y_min = np.percentile(y_values, 5)
-        y_max = np.percentile(y_values, 95)
+        # 5th/95th percentiles as order statistics from one partition
+        n = len(y_values) - 1
+        ranks = [int(0.05 * n), int(0.95 * n)]
+        y_min, y_max = np.partition(y_values, ranks)[ranks]
         
         return abs(y_max - y_min)
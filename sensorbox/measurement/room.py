@@ -108,7 +108,12 @@ class RoomMeasurement:
         if show_progress:
             print("Capturing RPLIDAR scans...")
         
-        all_points = []
+        # Scans are converted straight into one growing buffer, so no
+        # per-scan arrays are kept around for a final concatenation. The
+        # driver reads the serial port on its own thread, so the next scan
+        # keeps arriving while this one is converted.
+        points_buf: Optional[np.ndarray] = None
+        num_points = 0
         
         for i in range(num_scans):
             # read() returns a SensorFrame with data as (angle, distance, quality)
@@ -129,15 +134,28 @@ class RoomMeasurement:
             # Convert to radians
             angles_rad = np.radians(angles)
             
+            # Size the buffer from the first scan, doubling if later scans
+            # outgrow it
+            needed = num_points + len(scan_data)
+            if points_buf is None or needed > len(points_buf):
+                capacity = max(needed, num_scans * len(scan_data))
+                if points_buf is not None:
+                    capacity = max(capacity, 2 * len(points_buf))
+                grown = np.empty((capacity, 2), dtype=np.float32)
+                if points_buf is not None:
+                    grown[:num_points] = points_buf[:num_points]
+                points_buf = grown
+            
             # Convert to cartesian
-            points = self.wall_detector.scan_to_cartesian(angles_rad, distances)
-            all_points.append(points)
+            points = self.wall_detector.scan_to_cartesian(
+                angles_rad, distances, out=points_buf[num_points:]
+            )
+            num_points += len(points)
         
-        if not all_points:
+        if points_buf is None:
             raise RuntimeError("No valid RPLIDAR scans captured")
         
-        # Combine all scans
-        self._lidar_points = np.vstack(all_points)
+        self._lidar_points = points_buf[:num_points]
         
         if show_progress:
             print(f"Total RPLIDAR points: {len(self._lidar_points)}")
@@ -175,7 +193,9 @@ class RoomMeasurement:
             frame = self._oakd.read()
             
             if frame and frame.depth is not None:
-                valid_pct = (frame.depth > 0).sum() / frame.depth.size * 100
+                # Depth is unsigned with 0 marking invalid, so count_nonzero counts
+                # valid pixels without building a boolean mask
+                valid_pct = np.count_nonzero(frame.depth) / frame.depth.size * 100
                 
                 if valid_pct > 10:  # Only use frames with enough data
                     points = depth_to_pointcloud(frame.depth, subsample=2, max_depth=10000)
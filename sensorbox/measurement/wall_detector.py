@@ -4,6 +4,14 @@ import numpy as np
 from dataclasses import dataclass
 from typing import List, Tuple, Optional
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; fall back to NumPy
+    njit = None
+
+# Sampled point pairs closer than this (m) do not define a line
+_MIN_PAIR_SPAN = 0.1
+
 
 @dataclass
 class Wall:
@@ -23,6 +31,32 @@ class Wall:
         )
 
 
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _wall_ransac_kernel(points, pairs, threshold, out):
+        """Score each sampled line; out rows are (inliers, dx, dy)."""
+        for k in prange(pairs.shape[0]):
+            x1 = points[pairs[k, 0], 0]
+            y1 = points[pairs[k, 0], 1]
+            dx = points[pairs[k, 1], 0] - x1
+            dy = points[pairs[k, 1], 1] - y1
+            length = np.sqrt(dx * dx + dy * dy)
+            if length < _MIN_PAIR_SPAN:
+                out[k, 0] = -1.0
+                continue
+            dx /= length
+            dy /= length
+            
+            # Distance to the line is |(p - p1) x direction|
+            count = 0
+            for i in range(points.shape[0]):
+                if abs((points[i, 0] - x1) * dy - (points[i, 1] - y1) * dx) < threshold:
+                    count += 1
+            out[k, 0] = count
+            out[k, 1] = dx
+            out[k, 2] = dy
+
+
 class WallDetector:
     """Detect walls from RPLIDAR 2D scan data."""
     
@@ -32,29 +66,43 @@ class WallDetector:
         angle_threshold: float = 10.0,  # Degrees - max deviation for same wall
         distance_threshold: float = 0.1,  # Meters - max gap in wall
         ransac_iterations: int = 100,
+        seed: Optional[int] = None,  # Fixes the sampling for reproducible results
     ):
         self.min_wall_length = min_wall_length
         self.angle_threshold = np.radians(angle_threshold)
         self.distance_threshold = distance_threshold
         self.ransac_iterations = ransac_iterations
+        self._rng = np.random.default_rng(seed)
     
     def scan_to_cartesian(
         self, 
         angles: np.ndarray, 
         distances: np.ndarray,
         max_distance: float = 12.0,
+        out: Optional[np.ndarray] = None,
     ) -> np.ndarray:
-        """Convert polar scan to cartesian points."""
+        """Convert polar scan to cartesian points (float32, meters).
+        
+        If ``out`` is given (float32, at least as many rows as the scan), the
+        points are written into its leading rows and that view is returned.
+        """
         # Filter invalid readings
         valid = (distances > 0.1) & (distances < max_distance)
-        angles = angles[valid]
-        distances = distances[valid]
+        angles = angles[valid].astype(np.float32, copy=False)
+        distances = distances[valid].astype(np.float32, copy=False)
         
-        # Convert to cartesian
-        x = distances * np.cos(angles)
-        y = distances * np.sin(angles)
+        # Convert to cartesian straight into the output columns; float32 is
+        # well beyond the RPLIDAR's millimetre resolution
+        if out is None:
+            out = np.empty((len(angles), 2), dtype=np.float32)
+        else:
+            out = out[:len(angles)]
+        np.cos(angles, out=out[:, 0])
+        out[:, 0] *= distances
+        np.sin(angles, out=out[:, 1])
+        out[:, 1] *= distances
         
-        return np.column_stack([x, y])
+        return out
     
     def detect_walls(self, points: np.ndarray) -> List[Wall]:
         """Detect walls from 2D points using RANSAC line fitting."""
@@ -88,105 +136,94 @@ class WallDetector:
         points: np.ndarray,
     ) -> Tuple[Optional[Wall], np.ndarray]:
         """Fit a wall using RANSAC."""
-        best_wall = None
-        best_inliers = np.array([])
-        best_score = 0
-        
         n_points = len(points)
         
-        for _ in range(self.ransac_iterations):
-            # Random sample 2 points
-            idx = np.random.choice(n_points, 2, replace=False)
-            p1, p2 = points[idx]
-            
-            # Skip if points too close
-            if np.linalg.norm(p2 - p1) < 0.1:
-                continue
-            
-            # Line parameters
-            direction = p2 - p1
-            direction = direction / np.linalg.norm(direction)
-            normal = np.array([-direction[1], direction[0]])
-            
-            # Distance of all points to line
-            diff = points - p1
-            distances = np.abs(diff @ normal)
+        # Sample every hypothesis up front; pairs closer than 10 cm (including
+        # a point paired with itself) are skipped
+        pairs = self._rng.integers(0, n_points, size=(self.ransac_iterations, 2))
+        
+        if njit is not None:
+            scores = np.empty((len(pairs), 3), dtype=np.float64)
+            _wall_ransac_kernel(points, pairs, self.distance_threshold, scores)
+            best = scores[:, 0].argmax()
+            if scores[best, 0] < 0:
+                return None, np.array([], dtype=np.intp)
+            p1 = points[pairs[best, 0]]
+            direction = scores[best, 1:3]
+        else:
+            p1s = points[pairs[:, 0]]
+            directions = points[pairs[:, 1]] - p1s
+            lengths = np.hypot(directions[:, 0], directions[:, 1])
+            keep = lengths >= _MIN_PAIR_SPAN
+            if not keep.any():
+                return None, np.array([], dtype=np.intp)
             
-            # Find inliers
-            inliers = np.where(distances < self.distance_threshold)[0]
+            p1s = p1s[keep]
+            directions = directions[keep] / lengths[keep, None]
+            normals = np.column_stack([-directions[:, 1], directions[:, 0]])
+            offsets = np.einsum('ki,ki->k', p1s, normals)
             
-            if len(inliers) > best_score:
-                best_score = len(inliers)
-                best_inliers = inliers
-                
-                # Compute wall from inliers
-                inlier_points = points[inliers]
-                
-                # Project points onto line to find extent
-                projections = diff[inliers] @ direction
-                min_proj = projections.min()
-                max_proj = projections.max()
-                
-                start = p1 + min_proj * direction
-                end = p1 + max_proj * direction
-                length = max_proj - min_proj
-                
-                angle = np.arctan2(direction[1], direction[0])
-                dist_to_origin = abs(np.cross(p1, direction))
-                
-                best_wall = Wall(
-                    start=tuple(start),
-                    end=tuple(end),
-                    length=length,
-                    angle=angle,
-                    distance=dist_to_origin,
-                    num_points=len(inliers),
-                )
+            # Score all hypotheses with one (N, K) matmul, in float32 and in
+            # place; that is plenty for a centimetre-scale threshold and
+            # halves the size of the distance matrix
+            distances = points.astype(np.float32, copy=False) @ normals.T.astype(np.float32)
+            distances -= offsets.astype(np.float32)
+            np.abs(distances, out=distances)
+            counts = np.count_nonzero(distances < self.distance_threshold, axis=0)
+            best = counts.argmax()
+            p1 = p1s[best]
+            direction = directions[best]
         
-        return best_wall, best_inliers
-    
-    def find_room_corners(self, walls: List[Wall]) -> List[Tuple[float, float]]:
-        """Find corners where walls intersect."""
-        corners = []
+        # Only the winner is projected to find its extent
+        normal = np.array([-direction[1], direction[0]])
+        diff = points - p1
+        inliers = np.flatnonzero(np.abs(diff @ normal) < self.distance_threshold)
+        
+        projections = diff[inliers] @ direction
+        min_proj = projections.min()
+        max_proj = projections.max()
         
-        for i, wall1 in enumerate(walls):
-            for wall2 in walls[i+1:]:
-                # Check if walls are roughly perpendicular (60-120 degrees)
-                angle_diff = abs(wall1.angle - wall2.angle)
-                angle_diff = min(angle_diff, np.pi - angle_diff)
-                
-                if np.pi/6 < angle_diff < 5*np.pi/6:  # 30-150 degrees
-                    corner = self._line_intersection(wall1, wall2)
-                    if corner is not None:
-                        corners.append(corner)
+        start = p1 + min_proj * direction
+        end = p1 + max_proj * direction
         
-        return corners
+        best_wall = Wall(
+            start=tuple(start),
+            end=tuple(end),
+            length=max_proj - min_proj,
+            angle=np.arctan2(direction[1], direction[0]),
+            distance=abs(p1[0] * direction[1] - p1[1] * direction[0]),
+            num_points=len(inliers),
+        )
+        return best_wall, inliers
     
-    def _line_intersection(
-        self, 
-        wall1: Wall, 
-        wall2: Wall,
-    ) -> Optional[Tuple[float, float]]:
-        """Find intersection of two wall lines."""
-        # Line 1: p1 + t * d1
-        p1 = np.array(wall1.start)
-        d1 = np.array(wall1.end) - p1
+    def find_room_corners(self, walls: List[Wall]) -> List[Tuple[float, float]]:
+        """Find corners where walls intersect."""
+        if len(walls) < 2:
+            return []
         
-        # Line 2: p2 + s * d2
-        p2 = np.array(wall2.start)
-        d2 = np.array(wall2.end) - p2
+        # All wall pairs at once; triu order matches a nested i < j loop
+        i, j = np.triu_indices(len(walls), k=1)
+        starts = np.array([w.start for w in walls], dtype=np.float64)
+        dirs = np.array([w.end for w in walls], dtype=np.float64) - starts
+        angles = np.array([w.angle for w in walls], dtype=np.float64)
         
-        # Solve for intersection
-        cross = d1[0] * d2[1] - d1[1] * d2[0]
-        if abs(cross) < 1e-10:
-            return None  # Parallel lines
+        # Keep roughly perpendicular pairs (30-150 degrees)
+        angle_diff = np.abs(angles[i] - angles[j])
+        angle_diff = np.minimum(angle_diff, np.pi - angle_diff)
+        keep = (angle_diff > np.pi/6) & (angle_diff < 5*np.pi/6)
         
-        diff = p2 - p1
-        t = (diff[0] * d2[1] - diff[1] * d2[0]) / cross
+        # Line k: starts[k] + t * dirs[k]; drop parallel pairs
+        d1 = dirs[i]
+        d2 = dirs[j]
+        cross = d1[:, 0] * d2[:, 1] - d1[:, 1] * d2[:, 0]
+        keep &= np.abs(cross) >= 1e-10
         
-        intersection = p1 + t * d1
+        i, j, d1, d2, cross = i[keep], j[keep], d1[keep], d2[keep], cross[keep]
+        diff = starts[j] - starts[i]
+        t = (diff[:, 0] * d2[:, 1] - diff[:, 1] * d2[:, 0]) / cross
+        corners = starts[i] + t[:, None] * d1
         
-        return tuple(intersection)
+        return [tuple(c) for c in corners.tolist()]
     
     def estimate_room_dimensions(
         self, 
@@ -226,32 +263,23 @@ class WallDetector:
         return (dimensions[0], dimensions[1])
     
     def _group_parallel_walls(self, walls: List[Wall]) -> List[List[Wall]]:
-        """Group walls that are roughly parallel."""
+        """Group walls that are roughly parallel.
+        
+        Wall directions are taken modulo pi and sorted; a new group starts
+        wherever consecutive directions differ by the angle threshold or more.
+        """
         if not walls:
             return []
         
-        groups = []
-        used = set()
+        angles = np.array([w.angle for w in walls]) % np.pi
+        order = np.argsort(angles)
+        sorted_angles = angles[order]
         
-        for i, wall in enumerate(walls):
-            if i in used:
-                continue
-            
-            group = [wall]
-            used.add(i)
-            
-            for j, other in enumerate(walls):
-                if j in used:
-                    continue
-                
-                # Check if parallel (angles within threshold)
-                angle_diff = abs(wall.angle - other.angle)
-                angle_diff = min(angle_diff, np.pi - angle_diff)
-                
-                if angle_diff < self.angle_threshold:
-                    group.append(other)
-                    used.add(j)
-            
-            groups.append(group)
+        breaks = np.flatnonzero(np.diff(sorted_angles) >= self.angle_threshold) + 1
+        groups = [[walls[i] for i in idx] for idx in np.split(order, breaks)]
+        
+        # Directions wrap at pi, so the last group may continue into the first
+        if len(groups) > 1 and sorted_angles[0] + np.pi - sorted_angles[-1] < self.angle_threshold:
+            groups[0] = groups.pop() + groups[0]
         
         return groups
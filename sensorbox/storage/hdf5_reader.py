@@ -43,9 +43,29 @@ class HDF5Reader:
                     scan = frame.lidar
     """
     
-    def __init__(self, filepath: str):
+    def __init__(self, filepath: str, reuse_buffers: bool = False):
+        """
+        Initialize HDF5 reader.
+        
+        Args:
+            filepath: Recording file path (.h5)
+            reuse_buffers: Read camera frames into two alternating
+                pre-allocated buffers per camera instead of a new array per
+                frame. Frame data is then only valid until the second
+                get_frame() after it; copy it to keep it.
+        """
         self._filepath = Path(filepath)
+        self._reuse_buffers = reuse_buffers
         self._file: Optional[h5py.File] = None
+        # Per-camera frames dataset and timestamps, keyed by camera ID
+        self._camera_frames: Dict[int, h5py.Dataset] = {}
+        self._camera_timestamps: Dict[int, np.ndarray] = {}
+        self._frame_buffers: Dict[int, np.ndarray] = {}
+        self._frame_sel = 0
+        self._lidar_timestamps: Optional[np.ndarray] = None
+        # Scan i spans rows offsets[i]:offsets[i + 1] of the scans dataset
+        self._lidar_offsets: Optional[np.ndarray] = None
+        self._lidar_scans: Optional[h5py.Dataset] = None
     
     @property
     def filepath(self) -> Path:
@@ -57,12 +77,38 @@ class HDF5Reader:
             raise FileNotFoundError(f"Recording not found: {self._filepath}")
         
         self._file = h5py.File(self._filepath, "r")
+        
+        # Resolve the camera groups and read the small timestamp arrays once,
+        # so frame lookups do not walk the file
+        for name, cam_group in self._file.get("cameras", {}).items():
+            cam_id = int(name.split("_")[1])
+            self._camera_frames[cam_id] = cam_group["frames"]
+            self._camera_timestamps[cam_id] = cam_group["timestamps"][:]
+            if self._reuse_buffers:
+                frames = cam_group["frames"]
+                self._frame_buffers[cam_id] = np.empty((2, *frames.shape[1:]), frames.dtype)
+        
+        # Read the scan lengths once; every scan lookup is then two offsets
+        lidar_group = self._file.get("lidar")
+        if lidar_group is not None and "timestamps" in lidar_group:
+            self._lidar_timestamps = lidar_group["timestamps"][:]
+        if lidar_group is not None and "scan_lengths" in lidar_group:
+            scan_lengths = lidar_group["scan_lengths"][:]
+            self._lidar_offsets = np.zeros(len(scan_lengths) + 1, dtype=np.int64)
+            np.cumsum(scan_lengths, out=self._lidar_offsets[1:])
+            self._lidar_scans = lidar_group["scans"]
     
     def close(self) -> None:
         """Close the HDF5 file."""
         if self._file:
             self._file.close()
             self._file = None
+        self._camera_frames = {}
+        self._camera_timestamps = {}
+        self._frame_buffers = {}
+        self._lidar_timestamps = None
+        self._lidar_offsets = None
+        self._lidar_scans = None
     
     @property
     def info(self) -> RecordingInfo:
@@ -107,35 +153,39 @@ class HDF5Reader:
         cameras = {}
         timestamp = 0.0
         
-        for name in self._file["cameras"]:
-            cam_id = int(name.split("_")[1])
-            cam_group = self._file["cameras"][name]
-            
-            if index < cam_group["frames"].shape[0]:
-                cameras[cam_id] = cam_group["frames"][index]
-                timestamp = cam_group["timestamps"][index]
+        # Alternate buffers so the previous frame stays intact
+        self._frame_sel ^= 1
+        for cam_id, frames in self._camera_frames.items():
+            if index < frames.shape[0]:
+                if self._reuse_buffers:
+                    buf = self._frame_buffers[cam_id][self._frame_sel]
+                    frames.read_direct(buf, source_sel=np.s_[index])
+                    cameras[cam_id] = buf
+                else:
+                    cameras[cam_id] = frames[index]
+                timestamp = self._camera_timestamps[cam_id][index]
         
         # Find matching LIDAR scan (closest timestamp)
         lidar = None
-        if "lidar" in self._file and "timestamps" in self._file["lidar"]:
-            lidar_ts = self._file["lidar"]["timestamps"][:]
-            if len(lidar_ts) > 0:
-                closest_idx = np.argmin(np.abs(lidar_ts - timestamp))
-                if abs(lidar_ts[closest_idx] - timestamp) < 0.1:
-                    lidar = self._get_lidar_scan(closest_idx)
+        lidar_ts = self._lidar_timestamps
+        if lidar_ts is not None and len(lidar_ts) > 0:
+            # Timestamps are recorded in order: the closest is at the
+            # insertion point or just before it (the earlier one on a tie)
+            closest_idx = int(np.searchsorted(lidar_ts, timestamp))
+            if closest_idx == len(lidar_ts) or (
+                closest_idx > 0
+                and timestamp - lidar_ts[closest_idx - 1] <= lidar_ts[closest_idx] - timestamp
+            ):
+                closest_idx -= 1
+            if abs(lidar_ts[closest_idx] - timestamp) < 0.1:
+                lidar = self._get_lidar_scan(closest_idx)
         
         return PlaybackFrame(timestamp=timestamp, cameras=cameras, lidar=lidar)
     
     def _get_lidar_scan(self, scan_index: int) -> np.ndarray:
         """Get a specific LIDAR scan by index."""
-        lidar_group = self._file["lidar"]
-        scan_lengths = lidar_group["scan_lengths"][:]
-        
-        # Calculate start position
-        start = int(np.sum(scan_lengths[:scan_index]))
-        length = int(scan_lengths[scan_index])
-        
-        return lidar_group["scans"][start:start + length]
+        start, end = self._lidar_offsets[scan_index:scan_index + 2]
+        return self._lidar_scans[start:end]
     
     def playback(
         self,
@@ -179,19 +229,11 @@ class HDF5Reader:
         if self._file is None:
             raise RuntimeError("File not open")
         
-        if "lidar" not in self._file:
+        if self._lidar_offsets is None:
             return []
         
-        scans = []
-        scan_lengths = self._file["lidar"]["scan_lengths"][:]
-        all_points = self._file["lidar"]["scans"][:]
-        
-        start = 0
-        for length in scan_lengths:
-            scans.append(all_points[start:start + length])
-            start += length
-        
-        return scans
+        # Views into one read of all points, split at the cached offsets
+        return np.split(self._lidar_scans[:], self._lidar_offsets[1:-1])
     
     def __enter__(self) -> "HDF5Reader":
         self.open()
@@ -1,13 +1,14 @@
 """HDF5 writer for OAK-D Pro data."""
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, TYPE_CHECKING
 from datetime import datetime
 from pathlib import Path
 import numpy as np
 import h5py
 import json
 
-from ..drivers.oakd import OakDFrame
+if TYPE_CHECKING:
+    from ..drivers.oakd import OakDFrame
 
 
 class OakDHDF5Writer:
@@ -91,7 +92,7 @@ class OakDHDF5Writer:
         self._file.close()
         self._file = None
     
-    def write(self, frame: OakDFrame) -> None:
+    def write(self, frame: "OakDFrame") -> None:
         """Write an OAK-D frame."""
         if self._file is None:
             raise RuntimeError("File not open")
@@ -214,12 +214,12 @@ class SyncedSensorFusion:
         last = 0.0
         
         while True:
-            if duration and (time.monotonic() - start) >= duration:
+            now = time.monotonic()
+            if duration and (now - start) >= duration:
                 break
             if max_frames and count >= max_frames:
                 break
             
-            now = time.monotonic()
             if now - last < interval:
                 time.sleep(0.005)
                 continue
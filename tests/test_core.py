@@ -7,6 +7,7 @@ Run with: pytest tests/ -v
 import pytest
 import numpy as np
 from datetime import datetime
+from unittest.mock import patch
 
 from sensorbox.core.frame import (
     SensorFrame,
@@ -46,6 +47,7 @@ class TestSensorFrame:
         assert frame.shape == (100, 100)
         assert frame.dtype == np.float32
         assert frame.nbytes == 100 * 100 * 4
+        assert not hasattr(frame, "__dict__")
 
 
 class TestSensorMetadata:
@@ -72,3 +74,39 @@ class TestArducamSensorMock:
         sensor = ArducamSensor(device_index=0)
         with pytest.raises(RuntimeError, match="not connected"):
             sensor.read()
+    
+    def test_read_rgb_reuses_buffer(self):
+        from sensorbox.drivers.camera import ArducamSensor
+        bgr = np.zeros((4, 6, 3), dtype=np.uint8)
+        bgr[..., 0] = 255  # blue
+        
+        with patch("sensorbox.drivers.camera.cv2.VideoCapture") as mock_cap:
+            cap = mock_cap.return_value
+            cap.isOpened.return_value = True
+            cap.get.side_effect = lambda prop: {3: 6, 4: 4, 5: 30}.get(prop, 0)
+            cap.read.side_effect = lambda: (True, bgr.copy())
+            
+            sensor = ArducamSensor(device_index=0)
+            sensor.connect()
+            first = sensor.read_rgb()
+            second = sensor.read_rgb()
+        
+        assert first.metadata["format"] == "RGB"
+        assert (second.data[..., 2] == 255).all()
+        assert np.shares_memory(first.data, second.data)
+
+
+class TestDepthToPointcloud:
+    def test_backprojects_valid_subsampled_pixels(self):
+        from sensorbox.core.pointcloud import CameraIntrinsics, depth_to_pointcloud
+        intrinsics = CameraIntrinsics(fx=2.0, fy=4.0, cx=1.0, cy=1.0, width=4, height=4)
+        depth = np.zeros((4, 4), dtype=np.uint16)
+        depth[0, 0] = 1000
+        depth[2, 2] = 2000
+        depth[0, 2] = 6000  # beyond max_depth
+        depth[1, 1] = 500   # skipped by the stride
+        
+        points = depth_to_pointcloud(depth, intrinsics, max_depth=5000, subsample=2)
+        
+        assert points.dtype == np.float32
+        np.testing.assert_allclose(points, [[-0.5, 0.25, 1.0], [1.0, -0.5, 2.0]], rtol=1e-6)
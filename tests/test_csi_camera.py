@@ -1,10 +1,16 @@
 """Tests for CSI camera driver."""
 
+import threading
+import time
+
+import numpy as np
 import pytest
 from unittest.mock import Mock, patch
 from sensorbox.drivers.csi_camera import (
     CSICamera,
     CameraConnectionError,
+    CameraReadError,
+    FRAME_POOL_SIZE,
     list_resolutions,
     RESOLUTIONS,
 )
@@ -40,6 +46,8 @@ class TestCSICameraUnit:
         assert "width=1280" in pipeline
         assert "height=720" in pipeline
         assert "framerate=30/1" in pipeline
+        assert "videoconvert" not in pipeline
+        assert "max-buffers=1" in pipeline
     
     def test_camera_properties(self):
         """Test camera property accessors."""
@@ -72,6 +80,166 @@ class TestCSICameraUnit:
         
         with pytest.raises(RuntimeError, match="not connected"):
             cam.read()
+    
+    def test_capture_grabs_then_retrieves(self):
+        """Test that the capture path decodes only the grabbed frame."""
+        cam = CSICamera(sensor_id=0, use_cuda=False)
+        cam._capture = Mock()
+        cam._capture.grab.return_value = True
+        cam._capture.retrieve.return_value = (True, np.zeros((720, 1280, 4), dtype=np.uint8))
+        
+        raw = cam._capture_raw(np.empty((720, 1280, 4), dtype=np.uint8))
+        frame = cam._build_frame(raw, raw)
+        
+        cam._capture.grab.assert_called_once()
+        cam._capture.retrieve.assert_called_once()
+        cam._capture.read.assert_not_called()
+        assert frame.shape == (720, 1280, 3)
+    
+    def test_capture_loop_keeps_latest_frame(self):
+        """Test that the capture thread replaces undelivered frames in place."""
+        cam = CSICamera(sensor_id=0, width=64, height=48, use_cuda=False)
+        grabbed = []
+        
+        def retrieve(dst):
+            grabbed.append(dst)
+            dst[:] = len(grabbed)
+            if len(grabbed) == 3:
+                cam._stop_event.set()
+            return True, dst
+        
+        cam._capture = Mock()
+        cam._capture.grab.return_value = True
+        cam._capture.retrieve.side_effect = retrieve
+        cam._frame_pool = [np.empty((48, 64, 4), dtype=np.uint8) for _ in range(5)]
+        cam._connected = True
+        
+        cam._capture_loop()
+        frame = cam.read()
+        
+        assert frame.shape == (48, 64, 3)
+        assert frame.data.base is cam._frame_pool[0]
+        assert frame.data[0, 0, 0] == 3
+        assert frame.sequence_number == 0
+        assert cam._frame_queue.empty()
+    
+    def test_capture_loop_spares_queued_and_recent_frames(self):
+        """Test that retrieve never writes the queued or a recently read frame."""
+        cam = CSICamera(sensor_id=0, width=64, height=48, use_cuda=False)
+        rng = np.random.default_rng(0)
+        delivered = []
+        clashes = []
+        retrieves = 0
+        
+        def retrieve(dst):
+            nonlocal retrieves
+            retrieves += 1
+            queued = list(cam._frame_queue.queue)
+            protected = queued + delivered[-(FRAME_POOL_SIZE - 2):]
+            if any(dst is f.data.base for f in protected):
+                clashes.append(retrieves)
+            dst[:] = retrieves % 256
+            
+            # The consumer reads about half of the frames
+            if queued and rng.random() < 0.5:
+                delivered.append(cam.read())
+            if retrieves == 2000:
+                cam._stop_event.set()
+            return True, dst
+        
+        cam._capture = Mock()
+        cam._capture.grab.return_value = True
+        cam._capture.retrieve.side_effect = retrieve
+        cam._frame_pool = [
+            np.empty((48, 64, 4), dtype=np.uint8) for _ in range(FRAME_POOL_SIZE)
+        ]
+        cam._connected = True
+        
+        cam._capture_loop()
+        
+        assert len(delivered) > 500
+        assert clashes == []
+    
+    def test_nv12_pipeline_converts_into_slot(self):
+        """Test the NV12 path converts into the pool slot without a GPU."""
+        cam = CSICamera(sensor_id=0, width=64, height=48, use_cuda=True)
+        assert "format=NV12" in cam.gstreamer_pipeline
+        
+        slot = np.empty((48, 64, 3), dtype=np.uint8)
+        frame = cam._build_frame(np.zeros((72, 64), dtype=np.uint8), slot)
+        
+        assert frame.data is slot
+    
+    def test_stream_without_decode_only_grabs(self):
+        """Test that stream(decode=False) never retrieves pixel data."""
+        cam = CSICamera(sensor_id=0, width=64, height=48, use_cuda=False)
+        capture = cam._capture = Mock()
+        capture.grab.return_value = True
+        cam._frame_pool = [np.empty((48, 64, 4), dtype=np.uint8) for _ in range(5)]
+        cam._connected = True
+        cam._decode_frames = False
+        cam._capture_thread = threading.Thread(target=cam._capture_loop, daemon=True)
+        cam._capture_thread.start()
+        
+        try:
+            frames = list(cam.stream(max_frames=3, decode=False))
+        finally:
+            cam.disconnect()
+        
+        assert [f.sequence_number for f in frames] == [0, 1, 2]
+        assert all(f.metadata["decoded"] is False for f in frames)
+        capture.retrieve.assert_not_called()
+    
+    def test_read_after_warmup_returns_a_fresh_frame(self):
+        """Test that a frame decoded before warmup() is not returned after it."""
+        cam = CSICamera(sensor_id=0, width=64, height=48, use_cuda=False)
+        
+        def retrieve(dst):
+            # Stamp each frame with the number of grab-only frames so far
+            dst[:] = min(cam._grab_count, 255)
+            return True, dst
+        
+        capture = cam._capture = Mock()
+        capture.grab.return_value = True
+        capture.retrieve.side_effect = retrieve
+        cam._frame_pool = [np.empty((48, 64, 4), dtype=np.uint8) for _ in range(5)]
+        cam._connected = True
+        cam._capture_thread = threading.Thread(target=cam._capture_loop, daemon=True)
+        cam._capture_thread.start()
+        
+        try:
+            assert cam.read().data[0, 0, 0] == 0
+            cam.warmup(5)
+            frame = cam.read()
+        finally:
+            cam.disconnect()
+        
+        assert frame.data[0, 0, 0] >= 5
+    
+    def test_terminal_failure_ends_stream_and_raises_on_read(self):
+        """Test that a stopped capture ends stream() but read() still raises."""
+        cam = CSICamera(sensor_id=0, use_cuda=False)
+        cam._connected = True
+        cam._capture_error = CameraReadError("Camera 0 failed")
+        cam._stop_event.set()
+        
+        assert list(cam.stream(max_frames=5)) == []
+        with pytest.raises(CameraReadError):
+            cam.read()
+    
+    def test_stop_while_throttled_ends_stream(self):
+        """Test that stopping during the target_fps wait ends stream() at once."""
+        cam = CSICamera(sensor_id=0, use_cuda=False)
+        cam._connected = True
+        cam._frame_queue.put(Mock())
+        
+        frames = cam.stream(target_fps=1)
+        next(frames)
+        cam._stop_event.set()
+        
+        start = time.monotonic()
+        assert list(frames) == []
+        assert time.monotonic() - start < 0.5
 
 
 class TestCSICameraIntegration:
@@ -0,0 +1,44 @@
+"""Tests for multi-camera capture."""
+
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import numpy as np
+from sensorbox.core.frame import SensorFrame, SensorType, FrameType
+from sensorbox.drivers.multi_camera import MultiCamera
+
+
+def _frame(sensor_id: int, timestamp: float, wall_time: datetime) -> SensorFrame:
+    return SensorFrame(
+        sensor_id=f"csi_camera_{sensor_id}",
+        sensor_type=SensorType.CAMERA,
+        frame_type=FrameType.IMAGE,
+        timestamp=timestamp,
+        wall_time=wall_time,
+        sequence_number=0,
+        data=np.zeros((4, 4, 3), dtype=np.uint8),
+    )
+
+
+class TestMultiCameraUnit:
+    """Unit tests (no hardware required)."""
+    
+    def test_skew_uses_the_shared_clock(self):
+        """Test that cameras started at different times are compared on wall time."""
+        t0 = datetime(2026, 1, 1, 12, 0, 0)
+        # CAM0 connected 10 s before CAM1, so its own timestamps run ahead,
+        # but its frame was captured 2 ms earlier
+        cam0 = Mock()
+        cam0.read.return_value = _frame(0, 10.0, t0)
+        cam1 = Mock()
+        cam1.read.return_value = _frame(1, 0.002, t0 + timedelta(milliseconds=2))
+        cameras = {0: cam0, 1: cam1}
+        
+        cams = MultiCamera([0, 1], sync_warmup_frames=0)
+        with patch.object(MultiCamera, "_connect_one", side_effect=cameras.get):
+            with cams:
+                multi_frame = cams.read()
+        
+        assert multi_frame.wall_time == t0
+        assert multi_frame.timestamp == 10.0
+        assert multi_frame.sync_skew_ns == 2_000_000
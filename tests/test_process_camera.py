@@ -0,0 +1,112 @@
+"""Tests for the process-backed CSI camera."""
+
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+from unittest.mock import patch
+import multiprocessing as mp
+import time
+
+import numpy as np
+import pytest
+from sensorbox.drivers import process_camera
+from sensorbox.drivers.csi_camera import CameraConnectionError, CameraReadError
+from sensorbox.drivers.process_camera import ProcessCSICamera
+
+
+class FakeCamera:
+    """Stands in for CSICamera in the worker; frame n is filled with n % 256."""
+    
+    fail_after = None
+    
+    def __init__(self, sensor_id=0, width=64, height=48, **kwargs):
+        self.sensor_id = f"csi_camera_{sensor_id}"
+        self._shape = (height, width, 3)
+        self._count = 0
+    
+    def connect(self):
+        pass
+    
+    def disconnect(self):
+        pass
+    
+    def read(self):
+        time.sleep(0.001)
+        if self.fail_after is not None and self._count >= self.fail_after:
+            raise CameraReadError("fake camera failed")
+        self._count += 1
+        return SimpleNamespace(
+            data=np.full(self._shape, self._count % 256, dtype=np.uint8),
+            timestamp=float(self._count),
+            wall_time=SimpleNamespace(timestamp=lambda: 0.0),
+        )
+
+
+class FailingCamera(FakeCamera):
+    fail_after = 3
+
+
+class UnopenableCamera(FakeCamera):
+    def connect(self):
+        raise CameraConnectionError("no such camera")
+
+
+def _camera(fake_cls):
+    # fork inherits the patched CSICamera; spawn would re-import the real one
+    cam = ProcessCSICamera(sensor_id=0, width=64, height=48)
+    cam._ctx = mp.get_context("fork")
+    return cam, patch.object(process_camera, "CSICamera", fake_cls)
+
+
+class TestProcessCSICameraUnit:
+    """Unit tests (no hardware required)."""
+    
+    def test_read_returns_newest_and_keeps_held_slot(self):
+        """Test that read() skips to the newest frame and the held one is not rewritten."""
+        cam, fake = _camera(FakeCamera)
+        with fake:
+            cam.connect()
+        
+        try:
+            first = cam.read()
+            held = first.data.copy()
+            time.sleep(0.1)
+            
+            assert np.array_equal(first.data, held)
+            assert first.data[0, 0, 0] == int(first.timestamp) % 256
+            
+            second = cam.read()
+            assert second.timestamp > first.timestamp + 10
+        finally:
+            cam.disconnect()
+    
+    def test_worker_failure_raises_on_read(self):
+        """Test that a failed worker surfaces as CameraReadError."""
+        cam, fake = _camera(FailingCamera)
+        with fake:
+            cam.connect()
+        
+        try:
+            with pytest.raises(CameraReadError):
+                for _ in range(10):
+                    cam.read()
+        finally:
+            cam.disconnect()
+    
+    def test_connect_error_releases_shared_memory(self):
+        """Test that a worker connect error unlinks the shared-memory ring."""
+        created = []
+        
+        class RecordingSharedMemory(shared_memory.SharedMemory):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                created.append(self.name)
+        
+        cam, fake = _camera(UnopenableCamera)
+        with fake, patch.object(shared_memory, "SharedMemory", RecordingSharedMemory):
+            with pytest.raises(CameraConnectionError, match="no such camera"):
+                cam.connect()
+        
+        assert not cam.is_connected
+        assert cam._shm is None
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=created[0])
@@ -1,11 +1,18 @@
 """Tests for RPLIDAR driver."""
 
+import queue
+import time
+
+import numpy as np
 import pytest
 from unittest.mock import Mock, patch
+from sensorbox.core.frame import FrameType
 from sensorbox.drivers.rplidar import (
+    LIDAR_DTYPE,
     RPLidarSensor,
     LidarConnectionError,
     discover_rplidars,
+    unpack_scan,
 )
 
 
@@ -42,6 +49,115 @@ class TestRPLidarUnit:
         
         with pytest.raises(RuntimeError, match="not connected"):
             lidar.read()
+    
+    def test_read_recovers_after_reconnect(self):
+        """Test that read() retries in place after a successful reconnect."""
+        lidar = RPLidarSensor(port="/dev/ttyUSB0", max_consecutive_failures=2)
+        lidar._lidar = Mock()
+        lidar._connected = True
+        lidar._scan_iterator = iter([])
+        
+        def reconnect():
+            lidar._scan_iterator = iter([[(15, 90.0, 1000.0)]])
+            return True
+        
+        lidar.reconnect = Mock(side_effect=reconnect)
+        
+        assert lidar.read() is None
+        frame = lidar.read()
+        
+        lidar.reconnect.assert_called_once()
+        assert frame.data.tolist() == [[90.0, 1000.0, 15.0]]
+    
+    def test_read_returns_latest_scan(self):
+        """Test that scans arriving between reads collapse to the newest one."""
+        lidar = RPLidarSensor(port="/dev/ttyUSB0")
+        lidar._lidar = Mock()
+        lidar._connected = True
+        scans = queue.Queue()
+        for i in range(1, 4):
+            scans.put([(i, i * 10.0, i * 100.0)])
+        lidar._scan_iterator = iter(scans.get, None)
+        
+        lidar._start_scan_thread()
+        while not scans.empty():
+            time.sleep(0.01)
+        time.sleep(0.05)
+        frame = lidar.read()
+        
+        assert frame.data.tolist() == [[30.0, 300.0, 3.0]]
+        assert lidar.stats["total_scans"] == 1
+        scans.put(None)
+    
+    def test_read_as_xyz_drops_zero_distance(self):
+        """Test that as_xyz converts to cartesian and drops empty returns."""
+        lidar = RPLidarSensor(port="/dev/ttyUSB0", as_xyz=True)
+        lidar._lidar = Mock()
+        lidar._connected = True
+        lidar._scan_iterator = iter([[(15, 0.0, 1000.0), (0, 45.0, 0.0), (10, 90.0, 500.0)]])
+        
+        frame = lidar.read()
+        
+        assert frame.frame_type == FrameType.POINT_CLOUD
+        assert frame.metadata["num_points"] == 2
+        np.testing.assert_allclose(
+            frame.data, [[1000.0, 0.0, 0.0, 15.0], [0.0, 500.0, 0.0, 10.0]], atol=1e-3
+        )
+    
+    def test_packed_scan_round_trips(self):
+        """Test that packed scans use 5-byte rows and unpack to float32."""
+        lidar = RPLidarSensor(port="/dev/ttyUSB0", packed=True)
+        lidar._lidar = Mock()
+        lidar._connected = True
+        lidar._scan_iterator = iter([[(15, 359.984375, 16383.75), (3, 0.5, 250.0)]])
+        
+        frame = lidar.read()
+        
+        assert frame.data.dtype == LIDAR_DTYPE
+        assert frame.data.itemsize == 5
+        np.testing.assert_allclose(
+            unpack_scan(frame.data), [[359.98, 16384.0, 15.0], [0.5, 250.0, 3.0]], atol=1e-3
+        )
+    
+    def test_reuse_buffers_alternate(self):
+        """Test that reuse_buffers keeps the previous frame intact."""
+        lidar = RPLidarSensor(port="/dev/ttyUSB0", reuse_buffers=True)
+        lidar._lidar = Mock()
+        lidar._connected = True
+        scans = queue.Queue()
+        lidar._scan_iterator = iter(scans.get, None)
+        
+        frames = []
+        for i in range(1, 4):
+            scans.put([(i, i * 10.0, i * 100.0)])
+            frames.append(lidar.read())
+        first, second, third = frames
+        
+        assert second.data.tolist() == [[20.0, 200.0, 2.0]]
+        assert np.shares_memory(first.data, third.data)
+        assert not np.shares_memory(second.data, third.data)
+    
+    def test_native_parse_splits_rotations(self):
+        """Test that the native parser yields one array per rotation."""
+        def packet(new_scan, quality, angle, distance):
+            a, d = int(angle * 64), int(distance * 4)
+            flags = 0b01 if new_scan else 0b10
+            return bytes([(quality << 2) | flags, ((a & 0x7F) << 1) | 1, a >> 7, d & 0xFF, d >> 8])
+        
+        rotation = [packet(i == 0, 10, i * 30.0, 0.0 if i == 3 else 1000.0 + i) for i in range(8)]
+        stream = b"".join(rotation) + packet(True, 10, 0.0, 1000.0)
+        
+        lidar = RPLidarSensor(port="/dev/ttyUSB0")
+        lidar._lidar = Mock(scanning=[True, 5, "normal"])
+        serial = lidar._lidar._serial
+        serial.in_waiting = 0
+        serial.read.side_effect = [stream[:13], stream[13:]]
+        
+        scan = next(lidar._iter_native_scans())
+        
+        assert scan.shape == (7, 3)
+        assert scan[0].tolist() == [10.0, 0.0, 1000.0]
+        assert 90.0 not in scan[:, 1]
 
 
 class TestRPLidarIntegration: